@@ -0,0 +1,93 @@
+"""
+Benchmarks of the conversion, validation and rendering of StreamField values,
+for each schema of schemas.py and each stream size.
+"""
+
+import pytest
+from django.test import override_settings
+
+from django_react_streamfield.widgets import (
+    BlockWidget,
+    ConfigJSONEncoder,
+    InputJSONEncoder,
+    split_prepared_value,
+    to_json_script,
+)
+
+
+def bench_to_python(run, stream):
+    run(stream.field.to_python, lambda: (stream.raw_json,))
+
+
+def bench_iterate(run, stream):
+    run(list, lambda: (stream.to_python(),))
+
+
+def bench_getitem(run, stream):
+    run(lambda value: value[len(value) // 2], lambda: (stream.to_python(),))
+
+
+def bench_get_prep_value(run, stream):
+    value = stream.converted_value()
+    run(lambda: stream.field.stream_block.get_prep_value(value))
+
+
+def bench_clean(run, stream):
+    value = stream.converted_value()
+    run(lambda: stream.field.stream_block.clean(value))
+
+
+def bench_prepare_value(run, stream):
+    value = stream.converted_value()
+    run(lambda: stream.field.stream_block.prepare_value(value))
+
+
+def bench_widget_render(run, stream):
+    value = stream.converted_value()
+    widget = BlockWidget(stream.field.stream_block)
+    run(lambda: widget.render("body", value))
+
+
+@pytest.mark.parametrize("encoding", ["single_pass", "two_pass"])
+@pytest.mark.parametrize("codec", ["json", "orjson"])
+def bench_encode_editor_value(run, benchmark, stream, codec, encoding):
+    """
+    The encoding of the prepared value by BlockWidget: split by split_prepared_value
+    into the value of the textarea and the extra keys merged by streamFieldInit
+    (single_pass), or, as before split_prepared_value, encoded twice: once with
+    InputJSONEncoder for the textarea and once with ConfigJSONEncoder for the
+    config of the editor (two_pass).
+    """
+    if codec == "orjson":
+        pytest.importorskip("orjson")
+    value = stream.converted_value()
+    widget = BlockWidget(stream.field.stream_block)
+    prepared_value = widget.get_streamfield_config(value)["value"]
+
+    if encoding == "single_pass":
+
+        def encode():
+            input_value, value_extras = split_prepared_value(prepared_value)
+            return to_json_script(input_value), to_json_script(value_extras)
+
+    else:
+
+        def encode():
+            return (
+                to_json_script(prepared_value, encoder=InputJSONEncoder),
+                to_json_script(prepared_value, encoder=ConfigJSONEncoder),
+            )
+
+    with override_settings(STREAMFIELD_JSON_CODEC=codec):
+        benchmark.extra_info["output_kib"] = sum(map(len, encode())) // 1024
+        run(encode)
+
+
+def bench_render(run, stream):
+    value = stream.converted_value()
+    run(lambda: stream.field.stream_block.render(value))
+
+
+def bench_get_searchable_content(run, stream):
+    value = stream.converted_value()
+    run(lambda: stream.field.stream_block.get_searchable_content(value))
@@ -0,0 +1,26 @@
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SECRET_KEY = "benchmarks"
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django_react_streamfield",
+    "benchapp",
+]
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "benchmarks.sqlite3"),
+        "TEST": {"NAME": os.path.join(BASE_DIR, "benchmarks.sqlite3")},
+    }
+}
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "APP_DIRS": True,
+    }
+]
+USE_TZ = True
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
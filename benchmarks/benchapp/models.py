@@ -0,0 +1,8 @@
+from django.db import models
+
+
+class Image(models.Model):
+    title = models.CharField(max_length=255)
+
+    def __str__(self):
+        return self.title
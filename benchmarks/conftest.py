@@ -0,0 +1,133 @@
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [BENCHMARKS_DIR, os.path.dirname(BENCHMARKS_DIR)]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bench_settings")
+
+SIZES = [10, 1000, 50000]
+
+# (benchmark name, peak memory in KiB, number of queries) of each benchmark run.
+measurements = []
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--stream-sizes",
+        default=",".join(map(str, SIZES)),
+        help="Comma-separated numbers of children of the benchmarked streams.",
+    )
+
+
+def pytest_configure(config):
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+
+    path = settings.DATABASES["default"]["NAME"]
+    if os.path.exists(path):
+        os.remove(path)
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+    from benchapp.models import Image
+
+    Image.objects.bulk_create(Image(title="Image %d" % i) for i in range(100))
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = [
+            int(size) for size in metafunc.config.getoption("stream_sizes").split(",")
+        ]
+        metafunc.parametrize("size", sizes)
+    if "schema" in metafunc.fixturenames:
+        from schemas import SCHEMAS
+
+        metafunc.parametrize("schema", list(SCHEMAS))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not measurements:
+        return
+    terminalreporter.section("peak memory and queries (first run)")
+    width = max(len(name) for name, peak, queries in measurements)
+    for name, peak, queries in sorted(measurements):
+        terminalreporter.write_line(
+            "%s  %10d KiB  %6d queries" % (name.ljust(width), peak, queries)
+        )
+
+
+class Stream:
+    """
+    A synthetic stream of a schema, with the StreamField it belongs to.
+    """
+
+    def __init__(self, schema, size):
+        from django_react_streamfield.codecs import get_codec
+
+        from schemas import make_field, make_stream_data
+
+        self.field = make_field(schema)
+        self.raw_json = get_codec().dumps(make_stream_data(self.field, size))
+
+    def to_python(self):
+        return self.field.to_python(self.raw_json)
+
+    def converted_value(self):
+        """
+        Return the stream with all its children converted to their native value.
+        """
+        value = self.to_python()
+        list(value)
+        return value
+
+
+_streams = {}
+
+
+@pytest.fixture
+def stream(schema, size):
+    if (schema, size) not in _streams:
+        _streams[(schema, size)] = Stream(schema, size)
+    return _streams[(schema, size)]
+
+
+@pytest.fixture
+def run(benchmark, request, size):
+    """
+    Benchmark `target`, called with the arguments returned by `setup`
+    if given, anew for each round. The first run, before the benchmark,
+    records the peak memory allocated and the number of queries made.
+    """
+    from django.db import connection
+
+    def run(target, setup=None):
+        args = setup() if setup is not None else ()
+        # Not CaptureQueriesContext, whose log is capped to 9000 queries.
+        queries = []
+
+        def count_query(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        tracemalloc.start()
+        with connection.execute_wrapper(count_query):
+            target(*args)
+        peak = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+        benchmark.extra_info["peak_memory_kib"] = peak
+        benchmark.extra_info["queries"] = len(queries)
+        measurements.append((request.node.name, peak, len(queries)))
+
+        rounds = max(3, 10000 // size)
+        if setup is None:
+            return benchmark.pedantic(target, rounds=rounds)
+        return benchmark.pedantic(target, setup=lambda: (setup(), {}), rounds=rounds)
+
+    return run
@@ -0,0 +1,76 @@
+"""
+Synthetic block schemas and streams for the benchmarks.
+
+Each schema nests one level deeper than the previous one: "flat" only has field
+and chooser blocks, "nested" adds a StructBlock and a ListBlock, and "deep" adds
+a StreamBlock of the "nested" children.
+"""
+
+from django import forms
+
+from django_react_streamfield import blocks
+from django_react_streamfield.fields import StreamField
+from django_react_streamfield.generators import StreamGenerator
+
+from benchapp.models import Image
+
+
+class ImageChooserBlock(blocks.ChooserBlock):
+    target_model = Image
+    widget = forms.Select
+
+
+def flat_blocks():
+    return [
+        ("heading", blocks.CharBlock()),
+        ("link", blocks.URLBlock()),
+        ("image", ImageChooserBlock()),
+        ("date", blocks.DateBlock()),
+        (
+            "alignment",
+            blocks.ChoiceBlock(choices=[("left", "Left"), ("right", "Right")]),
+        ),
+    ]
+
+
+def nested_blocks():
+    return flat_blocks() + [
+        (
+            "card",
+            blocks.StructBlock(
+                [
+                    ("title", blocks.CharBlock()),
+                    ("image", ImageChooserBlock()),
+                    ("date", blocks.DateBlock()),
+                ]
+            ),
+        ),
+        ("gallery", blocks.ListBlock(ImageChooserBlock())),
+    ]
+
+
+def deep_blocks():
+    return nested_blocks() + [("section", blocks.StreamBlock(nested_blocks()))]
+
+
+SCHEMAS = {
+    "flat": flat_blocks,
+    "nested": nested_blocks,
+    "deep": deep_blocks,
+}
+
+
+def make_field(schema):
+    field = StreamField(SCHEMAS[schema]())
+    field.set_attributes_from_name("body")
+    return field
+
+
+def make_stream_data(field, size):
+    """
+    Return a raw stream of `size` random children, the same at each run.
+    """
+    generator = StreamGenerator(
+        seed=size, stream_length=(size, size), child_stream_length=(5, 5)
+    )
+    return generator.generate(field.stream_block)
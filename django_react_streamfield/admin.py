@@ -1,18 +1,39 @@
 from functools import update_wrapper
 
 from django.contrib.admin.options import ModelAdmin
-from django.urls import path
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import FieldDoesNotExist, PermissionDenied
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseNotModified,
+)
+from django.urls import path, reverse
+from django.views.decorators.http import require_POST
 
+from .blocks import StreamValue
+from .codecs import get_codec
+from .fields import StreamField
+from .forms import StreamFieldModelForm
 from .views import AutocompleteReverseLookupView
+from .widgets import get_definitions_script, split_prepared_value, to_json_script
 
 
 class StreamFieldAdmin(ModelAdmin):
+    # If set, StreamFields with more children only load the first
+    # streamfield_page_size of them in the editor, and the others on demand.
+    streamfield_page_size = None
+    # If True, the editor only submits the children of StreamFields that changed.
+    streamfield_delta = False
+    form = StreamFieldModelForm
+
     def get_urls(self):
         urlpatterns = super().get_urls()
 
-        def wrap(view):
+        def wrap(view, cacheable=False):
             def wrapper(*args, **kwargs):
-                return self.admin_site.admin_view(view)(*args, **kwargs)
+                return self.admin_site.admin_view(view, cacheable)(*args, **kwargs)
 
             wrapper.model_admin = self
             return update_wrapper(wrapper, view)
@@ -26,7 +47,119 @@ class StreamFieldAdmin(ModelAdmin):
         )
         urlpatterns.insert(0, reverse_lookup)
 
+        definitions = path(
+            "streamfield-definitions/<str:field_name>.js",
+            wrap(self.streamfield_definitions_view, cacheable=True),
+            name="%s_%s_streamfield_definitions" % info,
+        )
+        urlpatterns.insert(0, definitions)
+
+        children = path(
+            "streamfield-children/<str:field_name>/<path:object_id>/",
+            wrap(require_POST(self.streamfield_children_view)),
+            name="%s_%s_streamfield_children" % info,
+        )
+        urlpatterns.insert(0, children)
+
         return urlpatterns
 
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_dbfield(db_field, request, **kwargs)
+        if isinstance(db_field, StreamField) and formfield is not None:
+            # Load the block definitions from streamfield_definitions_view,
+            # instead of inlining them in every change form.
+            info = self.model._meta.app_label, self.model._meta.model_name
+            formfield.widget.definitions_url = reverse(
+                "%s:%s_%s_streamfield_definitions" % (self.admin_site.name, *info),
+                args=[db_field.name],
+            )
+            formfield.widget.delta = self.streamfield_delta
+            # The children listed as stubs are loaded from the stored object.
+            resolver_match = getattr(request, "resolver_match", None)
+            object_id = resolver_match and resolver_match.kwargs.get("object_id")
+            if self.streamfield_page_size and object_id is not None:
+                formfield.widget.page_size = self.streamfield_page_size
+                formfield.widget.children_url = reverse(
+                    "%s:%s_%s_streamfield_children" % (self.admin_site.name, *info),
+                    args=[db_field.name, object_id],
+                )
+        return formfield
+
     def autocomplete_reverse_view(self, request):
         return AutocompleteReverseLookupView.as_view(model_admin=self)(request)
+
+    def get_stream_field(self, field_name):
+        try:
+            field = self.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            raise Http404
+        if not isinstance(field, StreamField):
+            raise Http404
+        return field
+
+    def streamfield_definitions_view(self, request, field_name):
+        """
+        Return the script defining the child blocks of a StreamField.
+
+        The URL of the script has the hash of the definitions in its query string,
+        so the script is cached for good once loaded. The definitions are registered
+        under the path of the script, which the page knows whatever process serves it.
+        """
+        if not (
+            self.has_view_or_change_permission(request)
+            or self.has_add_permission(request)
+        ):
+            raise PermissionDenied
+        field = self.get_stream_field(field_name)
+
+        definitions_hash, script = get_definitions_script(
+            field.stream_block, request.path
+        )
+        etag = '"%s"' % definitions_hash
+        if request.META.get("HTTP_IF_NONE_MATCH") == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                script, content_type="application/javascript; charset=utf-8"
+            )
+        response["ETag"] = etag
+        if request.GET.get("v") == definitions_hash:
+            # The definitions are only served to staff users, so they are not
+            # cached by shared caches.
+            response["Cache-Control"] = "private, max-age=31536000, immutable"
+        else:
+            # Requested from a page rendered before the definitions changed.
+            response["Cache-Control"] = "private, no-cache"
+        response["Vary"] = "Accept-Language, Cookie"
+        return response
+
+    def streamfield_children_view(self, request, field_name, object_id):
+        """
+        Prepare the children of a StreamField of an object, whose ids are posted
+        as a JSON list, for the editor to load them. Used with streamfield_page_size,
+        for the children listed as stubs.
+        """
+        field = self.get_stream_field(field_name)
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            raise Http404
+        if not self.has_change_permission(request, obj):
+            raise PermissionDenied
+        try:
+            ids = get_codec().loads(request.body)
+        except ValueError:
+            return HttpResponseBadRequest()
+        if not isinstance(ids, list) or not all(
+            isinstance(block_id, str) for block_id in ids
+        ):
+            return HttpResponseBadRequest()
+        children = field.value_from_object(obj).get_children_by_id()
+        value = StreamValue.from_children(
+            field.stream_block,
+            [children[block_id] for block_id in ids if block_id in children],
+        )
+        value, extras = split_prepared_value(field.stream_block.prepare_value(value))
+        return HttpResponse(
+            to_json_script({"value": value, "extras": extras}),
+            content_type="application/json",
+        )
@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class DjangoReactStreamFieldConfig(AppConfig):
     name = "django_react_streamfield"
+
+    def ready(self):
+        from .definitions import load_compiled_definitions
+        from .instrumentation import configure_sinks
+
+        load_compiled_definitions()
+        configure_sinks()
@@ -1,29 +1,61 @@
 import collections
+import hashlib
+from contextvars import ContextVar
 from importlib import import_module
 
+from asgiref.sync import sync_to_async
 from django import forms
+from django.conf import settings
 from django.core import checks
-from django.core.exceptions import ImproperlyConfigured
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.template.loader import render_to_string
 from django.utils.encoding import force_str
 from django.utils.functional import cached_property
+from django.utils.inspect import func_supports_parameter
 from django.utils.safestring import mark_safe
 from django.utils.text import capfirst
+from django.utils.translation import get_language
 from django_react_streamfield.exceptions import RemovedError
 from django_react_streamfield.widgets import get_non_block_errors
 
+from ..codecs import get_codec
+from ..instrumentation import register_block_class
 from ..widgets import BlockWidget
 
 __all__ = [
     "BaseBlock",
     "Block",
     "BoundBlock",
+    "ChooserLoader",
     "DeclarativeSubBlocksMetaclass",
     "BlockWidget",
     "BlockField",
+    "get_render_cache",
 ]
 
 
+# Renderings looked up in bulk by StreamBlock.render, for StreamChild.render:
+# cache key => HTML, or None if the rendering is not cached.
+render_cache_lookup = ContextVar("render_cache_lookup", default=None)
+
+# Render cache keys computed by StreamBlock.render, for StreamChild.render:
+# id(stream child) => cache key.
+render_cache_keys = ContextVar("render_cache_keys", default=None)
+
+# The ChooserLoader of the objects referred to by the form data of a StreamField,
+# set by BlockWidget and BlockField while it is converted and validated.
+chooser_loader = ContextVar("chooser_loader", default=None)
+
+
+def get_render_cache():
+    """
+    Return the cache of block renderings, set by the STREAMFIELD_RENDER_CACHE setting.
+    """
+    return caches[getattr(settings, "STREAMFIELD_RENDER_CACHE", "default")]
+
+
 # =========================================
 # Top-level superclasses and helper objects
 # =========================================
@@ -42,6 +74,7 @@ class BaseBlock(type):
         meta_class_bases = tuple(filter(bool, meta_class_bases))
         cls._meta_class = type(str(name + "Meta"), meta_class_bases, {})
 
+        register_block_class(cls)
         return cls
 
 
@@ -59,6 +92,8 @@ class Block(metaclass=BaseBlock):
         classname = None
         group = ""
         closed = False
+        cache_render = False
+        cache_timeout = DEFAULT_TIMEOUT
 
     """
     Setting a 'dependencies' list serves as a shortcut for the common case where a complex block type
@@ -90,6 +125,11 @@ class Block(metaclass=BaseBlock):
 
         self.label = self.meta.label or ""
 
+        # Error-free instance HTML, by language; see get_instance_html.
+        self._instance_html = {}
+        # Definitions, by get_definition_cache_key; see definition.
+        self._definitions = {}
+
     def get_default(self):
         default = self.meta.default
         if callable(default):
@@ -124,14 +164,38 @@ class Block(metaclass=BaseBlock):
         """
         help_text = getattr(self.meta, "help_text", None)
         non_block_errors = get_non_block_errors(errors)
-        if help_text or non_block_errors:
+        if non_block_errors:
             return render_to_string(
                 "django_react_streamfield/block_forms/blocks_container.html",
                 {"help_text": help_text, "non_block_errors": non_block_errors,},
             )
+        if help_text:
+            # Without errors, the HTML is the same for every instance of the block.
+            language = get_language()
+            if language not in self._instance_html:
+                self._instance_html[language] = render_to_string(
+                    "django_react_streamfield/block_forms/blocks_container.html",
+                    {"help_text": help_text, "non_block_errors": ()},
+                )
+            return self._instance_html[language]
 
-    @cached_property
+    @property
     def definition(self):
+        """
+        The definition of the block used by the editor. It is computed by get_definition
+        once for each value of get_definition_cache_key, the active language by default.
+        """
+        key = self.get_definition_cache_key()
+        try:
+            return self._definitions[key]
+        except KeyError:
+            definition = self._definitions[key] = self.get_definition()
+            return definition
+
+    def get_definition_cache_key(self):
+        return get_language()
+
+    def get_definition(self):
         definition = {
             "key": self.name,
             "label": capfirst(self.label),
@@ -271,6 +335,88 @@ class Block(metaclass=BaseBlock):
         """
         return value
 
+    def bulk_collect(self, values, loader):
+        """
+        Register with the ChooserLoader `loader` the objects that bulk_resolve will need
+        to convert the list of raw values `values`. Blocks referring to model instances
+        (such as ChooserBlock) or containing such blocks override this, so that the
+        instances are fetched with a single query per model for a whole batch of values.
+        """
+        pass
+
+    def bulk_resolve(self, values, loader):
+        """
+        Convert the list of raw values `values` like to_python does, once the objects
+        registered by bulk_collect have been fetched by `loader`.
+        The converted values are returned in the same order.
+        """
+        if hasattr(self, "bulk_to_python"):
+            return self.bulk_to_python(values)
+        return [self.to_python(value) for value in values]
+
+    async def abulk_resolve(self, values, loader):
+        """
+        Async version of bulk_resolve. It is run in a thread if the conversion can
+        query the database, see bulk_resolve_queries.
+        """
+        if self.bulk_resolve_queries:
+            return await sync_to_async(self.bulk_resolve)(values, loader)
+        return self.bulk_resolve(values, loader)
+
+    @cached_property
+    def bulk_resolve_queries(self):
+        """
+        Whether bulk_resolve can query the database for this block or a block it
+        contains, because it falls back to a bulk_to_python method that does not
+        implement bulk_collect and bulk_resolve.
+        """
+        return any(
+            hasattr(block, "bulk_to_python")
+            and type(block).bulk_resolve is Block.bulk_resolve
+            for path, block in self.iter_block_paths()
+        )
+
+    def bulk_collect_datadict(self, data, files, loader):
+        """
+        Register with the ChooserLoader `loader` the objects referred to by the form
+        data `data` of this block, as passed to value_from_datadict, so that they are
+        fetched with a single query per model for a whole submitted StreamField.
+        """
+        pass
+
+    def extract_references(self, value):
+        """
+        Yield a (path, model, pk) tuple for each model instance that the raw JSONish
+        value `value` refers to, `path` being the tuple of the names of the blocks
+        leading to it from this block. The value is not converted, so no query is made.
+        """
+        return ()
+
+    @cached_property
+    def needs_bulk_loading(self):
+        """
+        Whether converting values of this block, or of the blocks it contains, fetches
+        objects that are better fetched in bulk, as for a ChooserBlock. The children of
+        a StreamValue using such a block are converted together, the others one by one.
+        """
+        return hasattr(self, "bulk_to_python")
+
+    def iter_block_paths(self):
+        """
+        Yield a (path, block) tuple for this block and each of its descendants,
+        `path` being the tuple of the names of the blocks leading to it from this
+        block, as in extract_references.
+        """
+        yield (), self
+
+    def get_reference_patterns(self, obj):
+        """
+        Return a list of JSONish patterns such that the raw value of this block
+        refers to the model instance `obj` if it contains one of them, containment
+        being that of the PostgreSQL @> operator. Used by the `references` lookup.
+        """
+        return []
+
     def get_prep_value(self, value):
         """
         The reverse of to_python; convert the python value into JSON-serialisable form.
@@ -313,6 +459,35 @@ class Block(metaclass=BaseBlock):
 
         return mark_safe(render_to_string(template, new_context))
 
+    async def arender(self, value, context=None):
+        """
+        Async version of render. Templates can query the database,
+        so they are rendered in a thread.
+        """
+        return await sync_to_async(self.render)(value, context=context)
+
+    def get_render_cache_key(self, block_id, prep_value, context=None):
+        """
+        Return the key under which the rendering of the stream child with the given id
+        and prep value is cached, or None if the block does not cache its rendering.
+
+        Caching is enabled by the cache_render Meta option; it should only be enabled
+        for blocks whose rendering depends on their value alone, and not on the rest
+        of the template context or on the database.
+        """
+        if not self.meta.cache_render or not block_id:
+            return None
+        key_data = "\n".join(
+            [
+                str(block_id),
+                self.name,
+                get_codec().dumps(prep_value),
+                self.get_template(context=context) or "",
+                get_language() or "",
+            ]
+        )
+        return "streamfield:render:%s" % hashlib.sha1(key_data.encode()).hexdigest()
+
     def get_api_representation(self, value, context=None):
         """
         Can be used to customise the API response and defaults to the value returned by get_prep_value.
@@ -513,6 +688,83 @@ class BoundBlock:
         return self.block.render(self.value)
 
 
+class ChooserLoader:
+    """
+    Collects the primary keys of the model instances that blocks refer to, then fetches
+    them with a single query per model. See Block.bulk_collect and Block.bulk_resolve.
+    """
+
+    def __init__(self):
+        self.pks = collections.defaultdict(set)
+        self.objects = collections.defaultdict(dict)
+        # model => the first block that collected primary keys of the model.
+        self.blocks = {}
+
+    def add(self, model, pks, block=None):
+        to_python = model._meta.pk.to_python
+        self.pks[model].update(to_python(pk) for pk in pks if pk is not None)
+        if block is not None:
+            self.blocks.setdefault(model, block)
+
+    def fetch(self, model, pks):
+        """
+        Return a dict of the instances of `model` with the given primary keys,
+        fetched by the first block that collected them (see ChooserBlock.bulk_fetch),
+        so that instrumentation reports the query as made by that block.
+        """
+        block = self.blocks.get(model)
+        if block is None:
+            return model.objects.in_bulk(pks)
+        return block.bulk_fetch(pks)
+
+    def load(self):
+        for model, pks in self.pks.items():
+            pks = pks.difference(self.objects[model])
+            if pks:
+                self.set_objects(model, pks, self.fetch(model, pks))
+
+    async def aload(self):
+        """
+        Async version of load. The ORM runs its queries in a single thread,
+        so the instances of the different models are fetched one after another,
+        without blocking the event loop.
+        """
+        for model, pks in self.pks.items():
+            await self.aload_model(model, pks)
+
+    async def aload_model(self, model, pks):
+        pks = pks.difference(self.objects[model])
+        if not pks:
+            return
+        if hasattr(model.objects, "ain_bulk"):
+            objects = await model.objects.ain_bulk(pks)
+        else:
+            # Django versions without an async ORM.
+            objects = await sync_to_async(self.fetch)(model, pks)
+        self.set_objects(model, pks, objects)
+
+    def set_objects(self, model, pks, objects):
+        self.objects[model].update(objects)
+        # Remember the missing objects too, so that they are not queried again.
+        self.objects[model].update((pk, None) for pk in pks.difference(objects))
+
+    def is_loaded(self, model, pk):
+        """
+        Return whether the instance of `model` with the given primary key was fetched,
+        or found missing.
+        """
+        try:
+            return model._meta.pk.to_python(pk) in self.objects[model]
+        except ValidationError:
+            return False
+
+    def get(self, model, pk):
+        """Return the loaded instance of `model` with the given primary key, or None."""
+        if pk is None:
+            return None
+        return self.objects[model].get(model._meta.pk.to_python(pk))
+
+
 class DeclarativeSubBlocksMetaclass(BaseBlock):
     """
     Metaclass that collects sub-blocks declared on the base classes.
@@ -569,9 +821,21 @@ class BlockField(forms.Field):
             kwargs["widget"] = BlockWidget(block)
 
         super().__init__(**kwargs)
+        # The StreamValue edited by the form, set by StreamFieldFormMixin.
+        self.previous_value = None
 
     def clean(self, value):
-        return self.block.clean(value)
+        # Validate the chooser blocks with the objects that the widget fetched.
+        token = chooser_loader.set(getattr(self.widget, "chooser_loader", None))
+        try:
+            # Blocks overriding clean may not accept previous_value.
+            if self.previous_value is None or not func_supports_parameter(
+                self.block.clean, "previous_value"
+            ):
+                return self.block.clean(value)
+            return self.block.clean(value, previous_value=self.previous_value)
+        finally:
+            chooser_loader.reset(token)
 
 
 DECONSTRUCT_ALIASES = {
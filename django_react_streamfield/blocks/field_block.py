@@ -1,6 +1,7 @@
 import datetime
 
 from django import forms
+from django.core.exceptions import ValidationError
 from django.db.models.fields import BLANK_CHOICE_DASH
 from django.forms.fields import CallableChoiceIterator
 from django.template.loader import render_to_string
@@ -10,7 +11,8 @@ from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
-from .base import Block
+from ..debug import record_chooser_query
+from .base import Block, ChooserLoader, chooser_loader
 
 
 class FieldBlock(Block):
@@ -110,9 +112,8 @@ class FieldBlock(Block):
                 value, prefix=Block.FIELD_NAME_TEMPLATE, errors=errors
             )
 
-    @cached_property
-    def definition(self):
-        definition = super(FieldBlock, self).definition
+    def get_definition(self):
+        definition = super(FieldBlock, self).get_definition()
         definition["html"] = self.render_form(
             self.get_default(), prefix=self.FIELD_NAME_TEMPLATE
         )
@@ -708,6 +709,7 @@ class ChooserBlock(FieldBlock):
         if value is None:
             return value
         else:
+            record_chooser_query(self, "to_python")
             try:
                 return self.target_model.objects.get(pk=value)
             except self.target_model.DoesNotExist:
@@ -718,10 +720,66 @@ class ChooserBlock(FieldBlock):
 
         The instances must be returned in the same order as the values and keep None values.
         """
-        objects = self.target_model.objects.in_bulk(values)
-        return [
-            objects.get(id) for id in values
-        ]  # Keeps the ordering the same as in values.
+        loader = ChooserLoader()
+        self.bulk_collect(values, loader)
+        loader.load()
+        return self.bulk_resolve(values, loader)
+
+    async def abulk_to_python(self, values):
+        """Async version of bulk_to_python."""
+        loader = ChooserLoader()
+        self.bulk_collect(values, loader)
+        await loader.aload()
+        return await self.abulk_resolve(values, loader)
+
+    def bulk_collect(self, values, loader):
+        loader.add(self.target_model, values, block=self)
+
+    def bulk_fetch(self, pks):
+        """
+        Return a dict of the instances of the target model with the given primary
+        keys, for ChooserLoader.load.
+        """
+        return self.target_model.objects.in_bulk(pks)
+
+    def bulk_resolve(self, values, loader):
+        # Keeps the ordering the same as in values.
+        return [loader.get(self.target_model, value) for value in values]
+
+    def bulk_collect_datadict(self, data, files, loader):
+        value = self.field.widget.value_from_datadict(
+            {"value": data.get("value", self.get_default())}, files, "value"
+        )
+        if value in self.field.empty_values or isinstance(value, self.target_model):
+            return
+        try:
+            loader.add(self.target_model, [value], block=self)
+        except ValidationError:
+            # An invalid primary key, that clean reports.
+            pass
+
+    def extract_references(self, value):
+        if value is not None:
+            yield (), self.target_model, value
+
+    def get_reference_patterns(self, obj):
+        if obj._meta.concrete_model is not self.target_model._meta.concrete_model:
+            return []
+        return [self.get_prep_value(obj)]
+
+    @cached_property
+    def has_default_queryset(self):
+        """
+        Whether the form field chooses from all the objects of the target model,
+        so that it can be validated with the objects loaded by a ChooserLoader.
+        """
+        queryset = self.field.queryset
+        return (
+            queryset.model is self.target_model
+            and not queryset.query.where
+            and not queryset.query.is_sliced
+            and self.field.to_field_name is None
+        )
 
     def get_prep_value(self, value):
         # the native value (a model instance or None) should serialise to a PK or None
@@ -734,7 +792,11 @@ class ChooserBlock(FieldBlock):
         # ModelChoiceField sometimes returns an ID, and sometimes an instance; we want the instance
         if value is None or isinstance(value, self.target_model):
             return value
+        loader = chooser_loader.get()
+        if loader is not None and loader.is_loaded(self.target_model, value):
+            return loader.get(self.target_model, value)
         else:
+            record_chooser_query(self, "value_from_form")
             try:
                 return self.target_model.objects.get(pk=value)
             except self.target_model.DoesNotExist:
@@ -748,9 +810,29 @@ class ChooserBlock(FieldBlock):
         # type) so we convert our instance back to an ID here. It means we have a wasted round-trip to
         # the database when ModelChoiceField.clean promptly does its own lookup, but there's no easy way
         # around that...
+        # Within a form, the objects are fetched in bulk by BlockWidget beforehand.
         if isinstance(value, self.target_model):
             value = value.pk
-        return super().clean(value)
+        loader = chooser_loader.get()
+        if (
+            loader is None
+            or value in self.field.empty_values
+            or not self.has_default_queryset
+            or not loader.is_loaded(self.target_model, value)
+        ):
+            if value not in self.field.empty_values:
+                record_chooser_query(self, "clean")
+            return super().clean(value)
+        instance = loader.get(self.target_model, value)
+        if instance is None:
+            raise ValidationError(
+                self.field.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+        self.field.validate(instance)
+        self.field.run_validators(instance)
+        return self.value_from_form(instance)
 
     class Meta:
         # No icon specified here, because that depends on the purpose that the
@@ -9,7 +9,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from ..exceptions import RemovedError
 from ..widgets import BlockData
-from .base import Block
+from .base import Block, ChooserLoader
 
 __all__ = ["ListBlock"]
 
@@ -27,9 +27,8 @@ class ListBlock(Block):
 
         self.dependencies = [self.child_block]
 
-    @cached_property
-    def definition(self):
-        definition = super(ListBlock, self).definition
+    def get_definition(self):
+        definition = super(ListBlock, self).get_definition()
         definition.update(
             children=[self.child_block.definition],
             minNum=self.meta.min_num,
@@ -128,6 +127,58 @@ class ListBlock(Block):
         # Otherwise recursively call to_python on each child and return as a list.
         return [self.child_block.to_python(item) for item in value]
 
+    def bulk_to_python(self, values):
+        """
+        Convert a list of raw values like to_python does, with the objects referred to
+        by chooser blocks at any depth fetched with a single query per model.
+        """
+        loader = ChooserLoader()
+        self.bulk_collect(values, loader)
+        loader.load()
+        return self.bulk_resolve(values, loader)
+
+    async def abulk_to_python(self, values):
+        """Async version of bulk_to_python."""
+        loader = ChooserLoader()
+        self.bulk_collect(values, loader)
+        await loader.aload()
+        return await self.abulk_resolve(values, loader)
+
+    def bulk_collect(self, values, loader):
+        self.child_block.bulk_collect(
+            [item for value in values for item in value], loader
+        )
+
+    def extract_references(self, value):
+        for item in value:
+            for path, model, pk in self.child_block.extract_references(item):
+                yield ("item",) + path, model, pk
+
+    @cached_property
+    def needs_bulk_loading(self):
+        return self.child_block.needs_bulk_loading
+
+    def iter_block_paths(self):
+        yield (), self
+        for path, block in self.child_block.iter_block_paths():
+            yield ("item",) + path, block
+
+    def get_reference_patterns(self, obj):
+        return [[pattern] for pattern in self.child_block.get_reference_patterns(obj)]
+
+    def bulk_collect_datadict(self, data, files, loader):
+        for child_block_data in data["value"]:
+            self.child_block.bulk_collect_datadict(child_block_data, files, loader)
+
+    def bulk_resolve(self, values, loader):
+        # Convert the items of all of the lists at once, then split them back.
+        converted_items = iter(
+            self.child_block.bulk_resolve(
+                [item for value in values for item in value], loader
+            )
+        )
+        return [[next(converted_items) for item in value] for value in values]
+
     def get_prep_value(self, value):
         # recursively call get_prep_value on children and return as a list
         return [self.child_block.get_prep_value(item) for item in value]
@@ -1,4 +1,3 @@
-from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
 from .base import Block
@@ -11,9 +10,8 @@ class StaticBlock(Block):
     A block that just 'exists' and has no fields.
     """
 
-    @cached_property
-    def definition(self):
-        definition = Block.definition.func(self)
+    def get_definition(self):
+        definition = Block.get_definition(self)
         definition.update(
             isStatic=True,
             html=self.render_form(self.get_default(), prefix=self.FIELD_NAME_TEMPLATE),
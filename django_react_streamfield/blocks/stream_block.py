@@ -1,24 +1,42 @@
+import re
 import uuid
 from collections import OrderedDict, defaultdict
 from collections.abc import Sequence
 from uuid import uuid4
 
+from asgiref.sync import sync_to_async
 from django import forms
-from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.core.exceptions import (
+    NON_FIELD_ERRORS,
+    SuspiciousOperation,
+    ValidationError,
+)
 from django.forms.utils import ErrorList
 from django.utils.functional import cached_property
-from django.utils.html import format_html_join
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext as _
 
+from ..codecs import get_codec
 from ..exceptions import RemovedError
 from ..widgets import BlockData
-from .base import Block, BoundBlock, DeclarativeSubBlocksMetaclass
+from .base import (
+    Block,
+    BoundBlock,
+    ChooserLoader,
+    DeclarativeSubBlocksMetaclass,
+    get_render_cache,
+    render_cache_keys,
+    render_cache_lookup,
+)
 
 __all__ = [
     "BaseStreamBlock",
     "StreamBlock",
     "StreamValue",
     "StreamBlockValidationError",
+    "aprefetch_stream_values",
+    "prefetch_stream_values",
 ]
 
 
@@ -47,9 +65,8 @@ class BaseStreamBlock(Block):
 
         self.dependencies = self.child_blocks.values()
 
-    @cached_property
-    def definition(self):
-        definition = super(BaseStreamBlock, self).definition
+    def get_definition(self):
+        definition = super(BaseStreamBlock, self).get_definition()
         definition.update(
             children=[
                 child_block.definition for child_block in self.child_blocks.values()
@@ -113,20 +130,63 @@ class BaseStreamBlock(Block):
             ],
         )
 
-    def get_definition(self):
-        definition = super(BaseStreamBlock, self).get_definition()
-        definition.update(
-            children=[
-                child_block.get_definition()
-                for child_block in self.child_blocks.values()
-            ],
-            minNum=self.meta.min_num,
-            maxNum=self.meta.max_num,
-        )
-        html = self.get_blocks_container_html()
-        if html is not None:
-            definition["html"] = html
-        return definition
+    def validate_delta(self, delta):
+        """
+        Raise SuspiciousOperation unless the delta has a list of ids without
+        duplicates under "order", and a list of children with an id and a type
+        under "changed".
+        """
+        if not (
+            isinstance(delta, dict)
+            and isinstance(delta.get("order"), list)
+            and isinstance(delta.get("changed"), list)
+        ):
+            raise SuspiciousOperation("The StreamField delta is malformed.")
+        if not all(isinstance(block_id, str) for block_id in delta["order"]) or not all(
+            isinstance(child_block_data, dict)
+            and isinstance(child_block_data.get("id"), str)
+            and isinstance(child_block_data.get("type"), str)
+            for child_block_data in delta["changed"]
+        ):
+            raise SuspiciousOperation("The StreamField delta is malformed.")
+        if len(set(delta["order"])) != len(delta["order"]):
+            raise SuspiciousOperation("The StreamField delta has duplicate ids.")
+
+    def value_from_delta(self, delta, value, files, prefix):
+        """
+        Return the StreamValue resulting from applying a delta submitted by the editor
+        to `value`, the StreamValue it was rendered from.
+
+        The delta has the ids of the children in their new order under "order", and
+        the children that were added or changed under "changed", in the format read by
+        value_from_datadict. The other children are taken from `value` as they are,
+        and are not converted to their native value if they were not accessed yet.
+        Children that are no longer in `value` are left out. A malformed delta
+        is rejected with SuspiciousOperation, see validate_delta.
+        """
+        self.validate_delta(delta)
+        children = value.get_children_by_id()
+        changed = {
+            child_block_data["id"]: child_block_data
+            for child_block_data in delta["changed"]
+            if child_block_data["type"] in self.child_blocks
+        }
+        new_children = []
+        for block_id in delta["order"]:
+            if block_id in changed:
+                child_block = self.child_blocks[changed[block_id]["type"]]
+                new_children.append(
+                    StreamValue.StreamChild(
+                        child_block,
+                        child_block.value_from_datadict(
+                            changed[block_id], files, prefix
+                        ),
+                        id=block_id,
+                    )
+                )
+            elif block_id in children:
+                new_children.append(children[block_id])
+        return StreamValue.from_children(self, new_children)
 
     def prepare_value(self, value, errors=None):
         if value is None:
@@ -162,14 +222,42 @@ class BaseStreamBlock(Block):
     def required(self):
         return self.meta.required
 
-    def clean(self, value):
-        cleaned_data = []
+    def clean(self, value, previous_value=None):
+        """
+        If previous_value is given, the children of value that have the same id, type
+        and content as a child of previous_value, such as those taken from it by
+        value_from_delta, are not validated again: the child of previous_value is used
+        as is, and is not converted to its native value if it was not accessed yet.
+        The constraints on the whole stream are always checked.
+        """
+        previous_children = (
+            {} if previous_value is None else previous_value.get_children_by_id()
+        )
+        cleaned_children = []
+        block_types = []
+        has_unchanged_children = False
         errors = {}
         non_block_errors = ErrorList()
-        for i, child in enumerate(value):  # child is a StreamChild instance
+        for i in range(len(value)):
+            child = value.get_raw_or_child(i)
+            if isinstance(child, StreamValue.StreamChild):
+                block_id = child.id
+                block_types.append(child.block_type)
+            else:
+                block_id = child.get("id")
+                block_types.append(child["type"])
+            previous_child = previous_children.get(block_id)
+            if previous_child is not None and is_same_child(child, previous_child):
+                cleaned_children.append(previous_child)
+                has_unchanged_children = True
+                continue
+            if not isinstance(child, StreamValue.StreamChild):
+                child = value[i]
             try:
-                cleaned_data.append(
-                    (child.block.name, child.block.clean(child.value), child.id)
+                cleaned_children.append(
+                    StreamValue.StreamChild(
+                        child.block, child.block.clean(child.value), id=child.id
+                    )
                 )
             except ValidationError as e:
                 errors[i] = ErrorList([e])
@@ -192,8 +280,8 @@ class BaseStreamBlock(Block):
 
         if self.meta.block_counts:
             block_counts = defaultdict(int)
-            for item in value:
-                block_counts[item.block_type] += 1
+            for block_type in block_types:
+                block_counts[block_type] += 1
 
             for block_name, min_max in self.meta.block_counts.items():
                 block = self.child_blocks[block_name]
@@ -226,7 +314,12 @@ class BaseStreamBlock(Block):
                 block_errors=errors, non_block_errors=non_block_errors
             )
 
-        return StreamValue(self, cleaned_data)
+        if has_unchanged_children:
+            return StreamValue.from_children(self, cleaned_children)
+        return StreamValue(
+            self,
+            [(child.block.name, child.value, child.id) for child in cleaned_children],
+        )
 
     def to_python(self, value):
         # the incoming JSONish representation is a list of dicts, each with a 'type' and 'value' field
@@ -243,6 +336,72 @@ class BaseStreamBlock(Block):
             is_lazy=True,
         )
 
+    def bulk_to_python(self, values):
+        """
+        Convert a list of raw values like to_python does, with the objects referred to
+        by chooser blocks at any depth fetched with a single query per model.
+        """
+        loader = ChooserLoader()
+        self.bulk_collect(values, loader)
+        loader.load()
+        return self.bulk_resolve(values, loader)
+
+    async def abulk_to_python(self, values):
+        """Async version of bulk_to_python."""
+        loader = ChooserLoader()
+        self.bulk_collect(values, loader)
+        await loader.aload()
+        return await self.abulk_resolve(values, loader)
+
+    def bulk_collect(self, values, loader):
+        child_values = defaultdict(list)
+        for value in values:
+            for child_data in value:
+                if child_data["type"] in self.child_blocks:
+                    child_values[child_data["type"]].append(child_data["value"])
+        for type_name, raw_values in child_values.items():
+            self.child_blocks[type_name].bulk_collect(raw_values, loader)
+
+    def extract_references(self, value):
+        for child_data in value:
+            if child_data["type"] in self.child_blocks:
+                child_block = self.child_blocks[child_data["type"]]
+                for path, model, pk in child_block.extract_references(
+                    child_data["value"]
+                ):
+                    yield (child_data["type"],) + path, model, pk
+
+    @cached_property
+    def needs_bulk_loading(self):
+        return any(
+            child_block.needs_bulk_loading for child_block in self.child_blocks.values()
+        )
+
+    def iter_block_paths(self):
+        yield (), self
+        for name, child_block in self.child_blocks.items():
+            for path, block in child_block.iter_block_paths():
+                yield (name,) + path, block
+
+    def get_reference_patterns(self, obj):
+        return [
+            [{"type": name, "value": pattern}]
+            for name, child_block in self.child_blocks.items()
+            for pattern in child_block.get_reference_patterns(obj)
+        ]
+
+    def bulk_collect_datadict(self, data, files, loader):
+        for child_block_data in data["value"]:
+            if child_block_data["type"] in self.child_blocks:
+                self.child_blocks[child_block_data["type"]].bulk_collect_datadict(
+                    child_block_data, files, loader
+                )
+
+    def bulk_resolve(self, values, loader):
+        stream_values = [self.to_python(value) for value in values]
+        resolve_stream_children(get_bulk_stream_children(stream_values), loader)
+        return stream_values
+
     def get_prep_value(self, value):
         if not value:
             # Falsy values (including None, empty string, empty list, and
@@ -270,12 +429,42 @@ class BaseStreamBlock(Block):
             for child in value  # child is a StreamChild instance
         ]
 
+    def render(self, value, context=None):
+        if not self.get_template(context=context):
+            # StreamValue.iter_render looks up the cached renderings.
+            return self.render_basic(value, context=context)
+        # Look up the cached renderings of all the children at once.
+        children_keys = {
+            i: cache_key
+            for i, (child_block, cache_key) in enumerate(
+                value.get_render_cache_keys(context=context)
+            )
+            if cache_key is not None
+        }
+        if not children_keys:
+            return super().render(value, context=context)
+        cache_keys = list(children_keys.values())
+        lookup = dict(render_cache_lookup.get() or {})
+        lookup.update(dict.fromkeys(cache_keys))
+        lookup.update(get_render_cache().get_many(cache_keys))
+        # The children rendered by the template reuse the keys computed here.
+        keys = dict(render_cache_keys.get() or {})
+        keys.update({id(value[i]): cache_key for i, cache_key in children_keys.items()})
+        lookup_token = render_cache_lookup.set(lookup)
+        keys_token = render_cache_keys.set(keys)
+        try:
+            return super().render(value, context=context)
+        finally:
+            render_cache_keys.reset(keys_token)
+            render_cache_lookup.reset(lookup_token)
+
+    async def arender(self, value, context=None):
+        # Fetch the objects of the chooser blocks asynchronously before rendering.
+        await aprefetch_stream_values([value])
+        return await super().arender(value, context=context)
+
     def render_basic(self, value, context=None):
-        return format_html_join(
-            "\n",
-            '<div class="block-{1}">{0}</div>',
-            [(child.render(context=context), child.block_type) for child in value],
-        )
+        return mark_safe("".join(value.iter_render(context=context, chunk_size=None)))
 
     def get_searchable_content(self, value):
         content = []
@@ -323,6 +512,92 @@ class StreamBlock(BaseStreamBlock, metaclass=DeclarativeSubBlocksMetaclass):
     pass
 
 
+ARRAY_START_RE = re.compile(r"\s*\[\s*")
+ITEM_END_RE = re.compile(r"\s*(?:(,)|\])\s*")
+
+
+class DeferredStreamData(Sequence):
+    """
+    The raw JSONish children of a stream, decoded from a JSON array one at a time
+    and only as far as they are accessed; reading the first child of a long stream
+    does not decode the ones after it. Children of unknown block types are skipped,
+    as StreamBlock.to_python does.
+
+    Raises ValueError if raw_json does not start like a JSON array. The children
+    themselves are only checked as they are decoded: if one of them is malformed,
+    `malformed` is set and the data is empty from then on, as StreamField.to_python
+    returns an empty stream for invalid JSON.
+    """
+
+    def __init__(self, raw_json, child_blocks):
+        match = ARRAY_START_RE.match(raw_json)
+        if match is None:
+            raise ValueError("StreamField JSON should be an array")
+        self.raw_json = raw_json
+        self.child_blocks = child_blocks
+        self.items = []
+        self.has_unknown_types = False
+        self.malformed = False
+        # Where the next child starts in raw_json, None once they are all decoded.
+        self.position = None if raw_json.startswith("]", match.end()) else match.end()
+
+    def decode(self, index=None):
+        """Decode children up to the given index, or all of them if index is None."""
+        codec = get_codec()
+        while self.position is not None and (index is None or index >= len(self.items)):
+            try:
+                item, end = codec.raw_decode(self.raw_json, self.position)
+                match = ITEM_END_RE.match(self.raw_json, end)
+                if match is None:
+                    raise ValueError(
+                        "Expecting ',' delimiter or ']' in StreamField JSON: char %d"
+                        % end
+                    )
+                is_known_type = item["type"] in self.child_blocks
+            except (ValueError, TypeError, KeyError):
+                self.items = []
+                self.position = None
+                self.malformed = True
+                return
+            self.position = match.end() if match.group(1) else None
+            if is_known_type:
+                self.items.append(item)
+            else:
+                self.has_unknown_types = True
+
+    def __getitem__(self, i):
+        if isinstance(i, slice) or i < 0:
+            self.decode()
+        else:
+            self.decode(i)
+        return self.items[i]
+
+    def __iter__(self):
+        i = 0
+        while True:
+            self.decode(i)
+            if i >= len(self.items):
+                return
+            yield self.items[i]
+            i += 1
+
+    def __len__(self):
+        self.decode()
+        return len(self.items)
+
+    def __bool__(self):
+        self.decode(0)
+        return bool(self.items)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return "<DeferredStreamData %s>" % self.raw_json
+
+
 class StreamValue(Sequence):
     """
     Custom type used to represent the value of a StreamBlock; behaves as a sequence of BoundBlocks
@@ -349,7 +624,47 @@ class StreamValue(Sequence):
             """
             return self.block.name
 
-    def __init__(self, stream_block, stream_data, is_lazy=False, raw_text=None):
+        def render(self, context=None, cache_key=None):
+            """
+            Render the child, using the render cache if its block has the cache_render
+            Meta option. `cache_key` can be passed if it is already known, otherwise
+            the one computed by StreamBlock.render is used, if any.
+            """
+            if cache_key is None:
+                if not self.block.meta.cache_render:
+                    return super().render(context=context)
+                cache_key = (render_cache_keys.get() or {}).get(id(self))
+            if cache_key is None:
+                cache_key = self.block.get_render_cache_key(
+                    self.id, self.block.get_prep_value(self.value), context=context
+                )
+                if cache_key is None:
+                    return super().render(context=context)
+            lookup = render_cache_lookup.get() or {}
+            if cache_key in lookup:
+                html = lookup[cache_key]
+            else:
+                html = get_render_cache().get(cache_key)
+            if html is None:
+                html = super().render(context=context)
+                get_render_cache().set(
+                    cache_key, str(html), self.block.meta.cache_timeout
+                )
+            return mark_safe(html)
+
+        def render_as_block(self, context=None):
+            return self.render(context=context)
+
+        def __str__(self):
+            return self.render()
+
+    # The number of children converted at once when one is accessed, if the stream
+    # data is decoded as it is accessed.
+    prefetch_window = 100
+
+    def __init__(
+        self, stream_block, stream_data, is_lazy=False, raw_text=None, raw_json=None
+    ):
         """
         Construct a StreamValue linked to the given StreamBlock,
         with child values given in stream_data.
@@ -359,6 +674,9 @@ class StreamValue(Sequence):
         (using block.to_python()) when accessed. In this mode, stream_data is a
         list of dicts, each containing 'type' and 'value' keys.
 
+        A lazy stream_data can also be a DeferredStreamData, which decodes these dicts
+        from the JSON string as they are accessed.
+
         Passing is_lazy=False means that stream_data consists of immediately usable
         native values. In this mode, stream_data is a list of (type_name, value)
         or (type_name, value, id) tuples.
@@ -368,6 +686,10 @@ class StreamValue(Sequence):
         migrated to a StreamField. In this situation we return a blank StreamValue
         with the raw text accessible under the `raw_text` attribute, so that migration
         code can be rewritten to convert it as desired.
+
+        raw_json is the JSON string that the lazy stream_data was decoded from, if known.
+        As long as the value is not dirty, it is saved back as is instead of being
+        serialised again.
         """
         self.is_lazy = is_lazy
         self.stream_block = (
@@ -377,16 +699,26 @@ class StreamValue(Sequence):
         self._bound_blocks = (
             {}
         )  # populated lazily from stream_data as we access items through __getitem__
-        self.raw_text = raw_text
+        self._raw_text = raw_text
+        self.raw_json = raw_json
+
+    @property
+    def raw_text(self):
+        if getattr(self.stream_data, "malformed", False):
+            # Found to be invalid as it was decoded, see DeferredStreamData.
+            return self.stream_data.raw_json
+        return self._raw_text
 
     def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
         if i not in self._bound_blocks:
             if self.is_lazy:
                 raw_value = self.stream_data[i]
                 type_name = raw_value["type"]
                 child_block = self.stream_block.child_blocks[type_name]
-                if hasattr(child_block, "bulk_to_python"):
-                    self._prefetch_blocks(type_name, child_block)
+                if child_block.needs_bulk_loading:
+                    self._prefetch_blocks(self.get_prefetch_indexes(i))
                     return self._bound_blocks[i]
                 else:
                     value = child_block.to_python(raw_value["value"])
@@ -406,30 +738,180 @@ class StreamValue(Sequence):
 
         return self._bound_blocks[i]
 
-    def _prefetch_blocks(self, type_name, child_block):
-        """Prefetch all child blocks for the given `type_name` using the
-        given `child_blocks`.
+    async def aget(self, i):
+        """
+        Async version of self[i], fetching the objects of the chooser blocks
+        asynchronously.
+        """
+        if i < 0:
+            i += len(self)
+        if self.is_lazy and i not in self._bound_blocks:
+            child_block = self.stream_block.child_blocks[self.stream_data[i]["type"]]
+            if child_block.needs_bulk_loading:
+                await aprefetch_stream_values(
+                    [self], indexes=self.get_prefetch_indexes(i)
+                )
+        return self[i]
 
-        This prevents n queries for n blocks of a specific type.
+    def get_prefetch_indexes(self, i):
         """
-        # create a mapping of all the child blocks matching the given block type,
-        # mapping (index within the stream) => (raw block value)
-        raw_values = OrderedDict(
-            (i, item["value"])
-            for i, item in enumerate(self.stream_data)
-            if item["type"] == type_name
-        )
-        # pass the raw block values to bulk_to_python as a list
-        converted_values = child_block.bulk_to_python(raw_values.values())
+        Return the indexes of the children to convert in bulk along with the child at
+        index i: all of them (None), unless the stream data is decoded as it is
+        accessed, in which case only the `prefetch_window` children from index i
+        are decoded and converted.
+        """
+        if not isinstance(self.stream_data, DeferredStreamData):
+            return None
+        self.stream_data.decode(i + self.prefetch_window - 1)
+        return range(i, min(i + self.prefetch_window, len(self.stream_data.items)))
 
-        # reunite the converted values with their stream indexes
-        for i, value in zip(raw_values.keys(), converted_values):
-            # also pass the block ID to StreamChild, if one exists for this stream index
-            block_id = self.stream_data[i].get("id")
-            self._bound_blocks[i] = StreamValue.StreamChild(
-                child_block, value, id=block_id
+    async def arender(self, context=None):
+        return await self.stream_block.arender(self, context=context)
+
+    def iter_render(self, context=None, chunk_size=100):
+        """
+        Render the children the way StreamBlock.render_basic does, yielding the HTML
+        of each child as soon as it is rendered, so that a long stream can be sent
+        with a StreamingHttpResponse.
+
+        The children that support bulk loading are converted `chunk_size` children
+        at a time, or all at once if `chunk_size` is None.
+        """
+        length = len(self)
+        chunk_size = chunk_size or length or 1
+        for start in range(0, length, chunk_size):
+            indexes = range(start, min(start + chunk_size, length))
+            cache_keys = self.get_render_cache_keys(context=context, indexes=indexes)
+
+            # Look up the cached renderings of the chunk at once, unless
+            # StreamBlock.render already did.
+            lookup = dict(render_cache_lookup.get() or {})
+            missing_keys = [
+                cache_key
+                for child_block, cache_key in cache_keys
+                if cache_key is not None and cache_key not in lookup
+            ]
+            if missing_keys:
+                lookup.update(dict.fromkeys(missing_keys))
+                lookup.update(get_render_cache().get_many(missing_keys))
+
+            # Cached children are not even converted to their native value.
+            self._prefetch_blocks(
+                [
+                    i
+                    for i, (child_block, cache_key) in zip(indexes, cache_keys)
+                    if lookup.get(cache_key) is None
+                ]
             )
 
+            for i, (child_block, cache_key) in zip(indexes, cache_keys):
+                if lookup.get(cache_key) is not None:
+                    html = mark_safe(lookup[cache_key])
+                else:
+                    token = render_cache_lookup.set(lookup)
+                    try:
+                        html = self[i].render(context=context, cache_key=cache_key)
+                    finally:
+                        render_cache_lookup.reset(token)
+                yield format_html(
+                    '{}<div class="block-{}">{}</div>',
+                    "\n" if i else "",
+                    child_block.name,
+                    html,
+                )
+
+    def get_render_cache_keys(self, context=None, indexes=None):
+        """
+        Return a list of (child block, render cache key) pairs for the children,
+        or only those at the given indexes, the key being None for blocks that
+        do not cache their rendering.
+        Children that were not accessed yet are not converted to their native value,
+        and the keys already computed by StreamBlock.render are reused.
+        """
+        known_keys = render_cache_keys.get() or {}
+        cache_keys = []
+        for i in range(len(self)) if indexes is None else indexes:
+            child = self._bound_blocks.get(i)
+            if child is not None and id(child) in known_keys:
+                cache_keys.append((child.block, known_keys[id(child)]))
+                continue
+            if self.is_lazy and i not in self._bound_blocks:
+                raw_value = self.stream_data[i]
+                child_block = self.stream_block.child_blocks[raw_value["type"]]
+                block_id = raw_value.get("id")
+                prep_value = raw_value["value"]
+            else:
+                child = self[i]
+                child_block = child.block
+                block_id = child.id
+                prep_value = None
+                if child_block.meta.cache_render:
+                    prep_value = child_block.get_prep_value(child.value)
+            cache_keys.append(
+                (
+                    child_block,
+                    child_block.get_render_cache_key(
+                        block_id, prep_value, context=context
+                    ),
+                )
+            )
+        return cache_keys
+
+    @classmethod
+    def from_children(cls, stream_block, children):
+        """
+        Return a StreamValue of the given children, each one being either its raw
+        JSONish data, converted to its native value when accessed, or a StreamChild.
+        """
+        stream_data = []
+        bound_blocks = {}
+        for i, child in enumerate(children):
+            if isinstance(child, StreamValue.StreamChild):
+                bound_blocks[i] = child
+                child = {
+                    "type": child.block.name,
+                    "value": child.block.get_prep_value(child.value),
+                    "id": child.id,
+                }
+            stream_data.append(child)
+        value = cls(stream_block, stream_data, is_lazy=True)
+        value._bound_blocks = bound_blocks
+        return value
+
+    def get_raw_or_child(self, i):
+        """
+        Return the raw JSONish data of the child at index i if it was not accessed yet,
+        or else its StreamChild.
+        """
+        if self.is_lazy and i not in self._bound_blocks:
+            return self.stream_data[i]
+        return self[i]
+
+    def get_children_by_id(self):
+        """
+        Return a dict of the id of each child that has one => the child,
+        as returned by get_raw_or_child.
+        """
+        children = {}
+        for i in range(len(self)):
+            child = self.get_raw_or_child(i)
+            if isinstance(child, StreamValue.StreamChild):
+                block_id = child.id
+            else:
+                block_id = child.get("id")
+            if block_id is not None:
+                children[block_id] = child
+        return children
+
+    def _prefetch_blocks(self, indexes=None):
+        """Prefetch all the child blocks that support bulk loading,
+        or only those at the given indexes.
+
+        This prevents n queries for n blocks of a specific type, and fetches
+        the objects of every block type referring to the same model in a single query.
+        """
+        prefetch_stream_values([self], indexes=indexes)
+
     def get_prep_value(self):
         prep_value = []
 
@@ -457,8 +939,38 @@ class StreamValue(Sequence):
 
             prep_value.append(prep_value_item)
 
+        # The ids assigned above (and any change made since) are missing from raw_json.
+        self.raw_json = None
         return prep_value
 
+    @property
+    def dirty(self):
+        """
+        Whether this value has to be serialised again to be saved, rather than
+        writing back raw_json. A lazy value that was only read is not dirty:
+        the children accessed so far are compared with the raw data they were
+        converted from, and the others are still in their raw form.
+        A value with children missing an id is dirty, so that ids get assigned.
+        """
+        if self.raw_json is None or not self.is_lazy:
+            return True
+        codec = get_codec()
+        for i, child in self._bound_blocks.items():
+            raw_value = self.stream_data[i]
+            if child.id != raw_value.get("id") or child.block.name != raw_value["type"]:
+                return True
+            prep_value = child.block.get_prep_value(child.value)
+            # Values such as dates only compare equal once serialised.
+            if (
+                prep_value != raw_value["value"]
+                and codec.loads(codec.dumps(prep_value)) != raw_value["value"]
+            ):
+                return True
+        if any("id" not in item for item in self.stream_data):
+            return True
+        # Unknown block types are dropped when saving.
+        return getattr(self.stream_data, "has_unknown_types", False)
+
     def __eq__(self, other):
         if not isinstance(other, StreamValue):
             return False
@@ -468,6 +980,10 @@ class StreamValue(Sequence):
     def __len__(self):
         return len(self.stream_data)
 
+    def __bool__(self):
+        # Unlike len(), this does not need a deferred stream_data to be fully decoded.
+        return bool(self.stream_data)
+
     def __repr__(self):
         return repr(list(self))
 
@@ -479,3 +995,112 @@ class StreamValue(Sequence):
 
     def __str__(self):
         return self.__html__()
+
+
+def get_child_data(child):
+    """
+    Return the type and JSONish value of a child, as returned by
+    StreamValue.get_raw_or_child.
+    """
+    if isinstance(child, StreamValue.StreamChild):
+        return child.block.name, child.block.get_prep_value(child.value)
+    return child["type"], child["value"]
+
+
+def is_same_child(child, other):
+    """
+    Return whether two children, as returned by StreamValue.get_raw_or_child,
+    have the same type and JSONish value.
+    """
+    if child is other:
+        return True
+    type_name, prep_value = get_child_data(child)
+    other_type_name, other_prep_value = get_child_data(other)
+    if type_name != other_type_name:
+        return False
+    if prep_value == other_prep_value:
+        return True
+    # Values such as dates only compare equal once serialised.
+    codec = get_codec()
+    return codec.loads(codec.dumps(prep_value)) == codec.loads(
+        codec.dumps(other_prep_value)
+    )
+
+
+def prefetch_stream_values(stream_values, indexes=None):
+    """
+    Convert the children of the given StreamValues whose block supports bulk loading
+    (such as ChooserBlock) and that were not accessed yet. The objects they refer to are
+    fetched with a single query per model for all of the StreamValues, instead of one
+    query per block type for each StreamValue.
+
+    If `indexes` is given, only the children at these indexes are converted.
+    """
+    children = get_bulk_stream_children(stream_values, indexes=indexes)
+    loader = ChooserLoader()
+    for child_block, items in children.values():
+        child_block.bulk_collect([item["value"] for _, _, item in items], loader)
+    loader.load()
+    resolve_stream_children(children, loader)
+
+
+async def aprefetch_stream_values(stream_values, indexes=None):
+    """
+    Async version of prefetch_stream_values, fetching the instances of the different
+    models without blocking the event loop.
+    """
+    children = get_bulk_stream_children(stream_values, indexes=indexes)
+    loader = ChooserLoader()
+    for child_block, items in children.values():
+        child_block.bulk_collect([item["value"] for _, _, item in items], loader)
+    await loader.aload()
+    for child_block, items in children.values():
+        values = await child_block.abulk_resolve(
+            [item["value"] for _, _, item in items], loader
+        )
+        bind_stream_children(child_block, items, values)
+
+
+def get_bulk_stream_children(stream_values, indexes=None):
+    """
+    Group by block the children of the given StreamValues (at the given indexes,
+    if any) that support bulk loading and were not accessed yet, as a dict of
+    id(child block) => (child block, [(stream value, index, raw child data)]).
+    """
+    children = OrderedDict()
+    for stream_value in stream_values:
+        if not stream_value.is_lazy:
+            continue
+        child_blocks = stream_value.stream_block.child_blocks
+        for i in range(len(stream_value.stream_data)) if indexes is None else indexes:
+            item = stream_value.stream_data[i]
+            child_block = child_blocks[item["type"]]
+            if i in stream_value._bound_blocks or not child_block.needs_bulk_loading:
+                continue
+            children.setdefault(id(child_block), (child_block, []))[1].append(
+                (stream_value, i, item)
+            )
+    return children
+
+
+def resolve_stream_children(children, loader):
+    """
+    Convert the children grouped by get_bulk_stream_children, once `loader` has fetched
+    the objects they need, and bind them to their StreamValues.
+    """
+    for child_block, items in children.values():
+        values = child_block.bulk_resolve(
+            [item["value"] for _, _, item in items], loader
+        )
+        bind_stream_children(child_block, items, values)
+
+
+def bind_stream_children(child_block, items, values):
+    """
+    Bind the converted values of children grouped by get_bulk_stream_children
+    to their StreamValues.
+    """
+    for (stream_value, i, item), value in zip(items, values):
+        stream_value._bound_blocks[i] = StreamValue.StreamChild(
+            child_block, value, id=item.get("id")
+        )
@@ -9,7 +9,7 @@ from django.utils.html import format_html, format_html_join
 
 from ..exceptions import RemovedError
 from ..widgets import BlockData
-from .base import Block, DeclarativeSubBlocksMetaclass
+from .base import Block, ChooserLoader, DeclarativeSubBlocksMetaclass
 
 __all__ = ["BaseStructBlock", "StructBlock", "StructValue"]
 
@@ -51,9 +51,8 @@ class BaseStructBlock(Block):
 
         self.dependencies = self.child_blocks.values()
 
-    @cached_property
-    def definition(self):
-        definition = super(BaseStructBlock, self).definition
+    def get_definition(self):
+        definition = super(BaseStructBlock, self).get_definition()
         definition.update(
             isStruct=True,
             children=[
@@ -167,6 +166,88 @@ class BaseStructBlock(Block):
             ]
         )
 
+    def bulk_to_python(self, values):
+        """
+        Convert a list of raw values like to_python does, with the objects referred to
+        by chooser blocks at any depth fetched with a single query per model.
+        """
+        loader = ChooserLoader()
+        self.bulk_collect(values, loader)
+        loader.load()
+        return self.bulk_resolve(values, loader)
+
+    async def abulk_to_python(self, values):
+        """Async version of bulk_to_python."""
+        loader = ChooserLoader()
+        self.bulk_collect(values, loader)
+        await loader.aload()
+        return await self.abulk_resolve(values, loader)
+
+    def bulk_collect(self, values, loader):
+        for name, child_block in self.child_blocks.items():
+            child_block.bulk_collect(
+                [value[name] for value in values if name in value], loader
+            )
+
+    def extract_references(self, value):
+        for name, child_block in self.child_blocks.items():
+            if name in value:
+                for path, model, pk in child_block.extract_references(value[name]):
+                    yield (name,) + path, model, pk
+
+    @cached_property
+    def needs_bulk_loading(self):
+        return any(
+            child_block.needs_bulk_loading for child_block in self.child_blocks.values()
+        )
+
+    def iter_block_paths(self):
+        yield (), self
+        for name, child_block in self.child_blocks.items():
+            for path, block in child_block.iter_block_paths():
+                yield (name,) + path, block
+
+    def get_reference_patterns(self, obj):
+        return [
+            {name: pattern}
+            for name, child_block in self.child_blocks.items()
+            for pattern in child_block.get_reference_patterns(obj)
+        ]
+
+    def bulk_collect_datadict(self, data, files, loader):
+        for child_block_data in data["value"]:
+            if child_block_data["type"] in self.child_blocks:
+                self.child_blocks[child_block_data["type"]].bulk_collect_datadict(
+                    child_block_data, files, loader
+                )
+
+    def bulk_resolve(self, values, loader):
+        # Convert the values of each child block for all of the values at once.
+        converted_children = {
+            name: iter(
+                child_block.bulk_resolve(
+                    [value[name] for value in values if name in value], loader
+                )
+            )
+            for name, child_block in self.child_blocks.items()
+        }
+        return [
+            self._to_struct_value(
+                [
+                    (
+                        name,
+                        (
+                            next(converted_children[name])
+                            if name in value
+                            else child_block.get_default()
+                        ),
+                    )
+                    for name, child_block in self.child_blocks.items()
+                ]
+            )
+            for value in values
+        ]
+
     def _to_struct_value(self, block_items):
         """ Return a Structvalue representation of the sub-blocks in this block """
         return self.meta.value_class(self, block_items)
@@ -0,0 +1,158 @@
+from contextlib import ExitStack
+
+from django import forms
+from django.conf import settings
+from django.core import checks
+from django.db import DatabaseError, connections
+
+from .blocks import (
+    AutocompleteBlock,
+    BaseStreamBlock,
+    BaseStructBlock,
+    Block,
+    ChoiceBlock,
+    ChooserBlock,
+)
+
+__all__ = ["check_block_tree"]
+
+
+class _QueryAttempted(Exception):
+    pass
+
+
+def _refuse_query(execute, sql, params, many, context):
+    raise _QueryAttempted
+
+
+def queries_database(func):
+    """
+    Return whether calling `func` and iterating over its result attempts
+    a database query. The query is not run.
+    """
+    with ExitStack() as wrappers:
+        for connection in connections.all():
+            wrappers.enter_context(connection.execute_wrapper(_refuse_query))
+        try:
+            list(func())
+        except (_QueryAttempted, DatabaseError):
+            return True
+        except Exception:
+            # Broken choices are not a performance issue.
+            return False
+    return False
+
+
+def renders_every_object(block):
+    """
+    Return whether a chooser block renders every object of its target model as
+    the choices of a select. The form field is only built for blocks with a select
+    widget, and the blocks whose form field cannot be built are left out.
+    """
+    widget = getattr(block, "widget", None)
+    if isinstance(widget, type):
+        is_select = issubclass(widget, forms.Select)
+    else:
+        is_select = isinstance(widget, forms.Select)
+    if not is_select or getattr(block, "target_model", None) is None:
+        return False
+    try:
+        return not block.field.queryset.query.is_sliced
+    except Exception:
+        # A broken block is not a performance issue.
+        return False
+
+
+def check_block_tree(stream_block, field):
+    """
+    Return warnings about the shapes of the block tree of a StreamField
+    that are slow to load, validate or render.
+    """
+    max_depth = getattr(settings, "STREAMFIELD_MAX_BLOCK_DEPTH", 10)
+    max_child_blocks = getattr(settings, "STREAMFIELD_MAX_CHILD_BLOCKS", 50)
+    warnings = []
+    blocks = dict(stream_block.iter_block_paths())
+    # The blocks that can appear at several paths are checked once.
+    checked = set()
+    for path, block in blocks.items():
+        block_path = " > ".join((field.name,) + path)
+        if isinstance(block, ChooserBlock):
+            for i in range(len(path)):
+                parent = blocks[path[:i]]
+                if type(parent).bulk_collect is Block.bulk_collect:
+                    warnings.append(
+                        checks.Warning(
+                            "The chooser block %r is not loaded in bulk, "
+                            "its objects are fetched one query at a time." % block_path,
+                            hint="Implement bulk_collect and bulk_resolve in %s, "
+                            "the class of its parent block %r."
+                            % (
+                                type(parent).__name__,
+                                " > ".join((field.name,) + path[:i]),
+                            ),
+                            obj=field,
+                            id="streamfield.W001",
+                        )
+                    )
+                    break
+        if max_depth is not None and len(path) == max_depth + 1:
+            warnings.append(
+                checks.Warning(
+                    "The block %r is nested deeper than %d levels."
+                    % (block_path, max_depth),
+                    hint="Deep block trees are slow to convert, validate and render, "
+                    "and their definitions are large. Flatten the tree, "
+                    "or raise STREAMFIELD_MAX_BLOCK_DEPTH.",
+                    obj=field,
+                    id="streamfield.W004",
+                )
+            )
+        if id(block) in checked:
+            continue
+        checked.add(id(block))
+        if (
+            isinstance(block, ChooserBlock)
+            and not isinstance(block, AutocompleteBlock)
+            and renders_every_object(block)
+        ):
+            warnings.append(
+                checks.Warning(
+                    "The chooser block %r renders every %s into the block "
+                    "definitions."
+                    % (block_path, block.target_model._meta.verbose_name),
+                    hint="Use an AutocompleteBlock or a widget loading the choices "
+                    "on demand, unless the table stays small.",
+                    obj=field,
+                    id="streamfield.W002",
+                )
+            )
+        if (
+            isinstance(block, ChoiceBlock)
+            and callable(block._constructor_kwargs["choices"])
+            and queries_database(block._constructor_kwargs["choices"])
+        ):
+            warnings.append(
+                checks.Warning(
+                    "The choices of the choice block %r query the database "
+                    "each time the block definitions are rendered." % block_path,
+                    hint="Cache the choices, or use a ChooserBlock.",
+                    obj=field,
+                    id="streamfield.W003",
+                )
+            )
+        if (
+            max_child_blocks is not None
+            and isinstance(block, (BaseStreamBlock, BaseStructBlock))
+            and len(block.child_blocks) > max_child_blocks
+        ):
+            warnings.append(
+                checks.Warning(
+                    "The block %r has %d child blocks, more than %d."
+                    % (block_path, len(block.child_blocks), max_child_blocks),
+                    hint="Wide blocks have large definitions, rendered with every "
+                    "form. Split the block, or raise STREAMFIELD_MAX_CHILD_BLOCKS.",
+                    obj=field,
+                    id="streamfield.W005",
+                )
+            )
+    return warnings
@@ -0,0 +1,102 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+__all__ = ["JSONCodec", "OrjsonCodec", "get_codec"]
+
+
+CODEC_ALIASES = {
+    "json": "django_react_streamfield.codecs.JSONCodec",
+    "orjson": "django_react_streamfield.codecs.OrjsonCodec",
+}
+
+
+class JSONCodec:
+    """
+    Encodes and decodes StreamField data using the standard library json module.
+
+    A custom codec should subclass this and override `dumps` and `loads`,
+    keeping the DjangoJSONEncoder semantics of the `cls` encoder
+    for the types JSON does not handle natively.
+    """
+
+    def dumps(self, data, cls=DjangoJSONEncoder, compact=False):
+        if compact:
+            # The same output as orjson.
+            return json.dumps(data, separators=(",", ":"), ensure_ascii=False, cls=cls)
+        return json.dumps(data, cls=cls)
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def raw_decode(self, data, index):
+        """
+        Decode the JSON document starting at `index` in `data`, ignoring what follows it.
+        Return the decoded value and the index where the document ends.
+        """
+        return self.decoder.raw_decode(data, index)
+
+    @cached_property
+    def decoder(self):
+        return json.JSONDecoder()
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Encodes and decodes StreamField data using orjson.
+
+    Dates and times are passed through to the encoder class rather than being
+    serialised by orjson, so that they are written exactly as DjangoJSONEncoder
+    writes them. Decimals, lazy strings and any other type orjson does not know
+    about are handled by the encoder class as well.
+    """
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError:
+            raise ImproperlyConfigured(
+                "The orjson StreamField codec requires the orjson package."
+            )
+        self.orjson = orjson
+        self.options = (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_NON_STR_KEYS
+        )
+
+    def dumps(self, data, cls=DjangoJSONEncoder, compact=False):
+        # orjson output is always compact.
+        return self.orjson.dumps(
+            data, default=cls().default, option=self.options
+        ).decode()
+
+    def loads(self, data):
+        return self.orjson.loads(data)
+
+
+_codecs = {}
+
+
+def get_codec():
+    """
+    Return the codec configured by the STREAMFIELD_JSON_CODEC setting,
+    either "json" (the default), "orjson" or the dotted path to a JSONCodec subclass.
+    """
+    path = getattr(settings, "STREAMFIELD_JSON_CODEC", "json")
+    try:
+        return _codecs[path]
+    except KeyError:
+        pass
+    try:
+        codec_class = import_string(CODEC_ALIASES.get(path, path))
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            "Could not import the StreamField JSON codec %r: %s" % (path, e)
+        )
+    codec = _codecs[path] = codec_class()
+    return codec
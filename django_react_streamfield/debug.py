@@ -0,0 +1,184 @@
+import sys
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .exceptions import ChooserQueryWarning, TooManyChooserQueries
+
+__all__ = [
+    "ChooserQueryMiddleware",
+    "ChooserQueryTracker",
+    "get_block_path",
+    "record_chooser_query",
+    "track_chooser_queries",
+]
+
+# The ChooserQueryTracker of the request being handled.
+chooser_query_tracker = ContextVar("chooser_query_tracker", default=None)
+
+# id(block) => the paths of the block in the StreamFields of the models.
+_block_paths = None
+
+# The modules whose frames are left out of code paths.
+_SKIPPED_MODULES = (
+    "django_react_streamfield.debug",
+    "django_react_streamfield.instrumentation",
+)
+_COMPREHENSIONS = ("<listcomp>", "<dictcomp>", "<setcomp>", "<genexpr>")
+
+
+def get_block_path(block):
+    """
+    Return the path of `block` in the StreamFields of the models, as in
+    "pages.page.body > gallery > item > image", or its class and name if it is
+    not in one.
+    """
+    global _block_paths
+    if _block_paths is None:
+        from .definitions import get_stream_fields
+
+        block_paths = {}
+        for key, field in get_stream_fields():
+            for path, child_block in field.stream_block.iter_block_paths():
+                block_paths.setdefault(id(child_block), []).append(
+                    " > ".join((key,) + path)
+                )
+        _block_paths = block_paths
+    paths = _block_paths.get(id(block))
+    if paths is None:
+        return "%s %r" % (type(block).__name__, block.name)
+    return " or ".join(paths)
+
+
+def get_code_path(frame):
+    """
+    Return the block methods and such of this package that led to `frame`,
+    and the first caller outside this package and Django.
+    """
+    functions = []
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("django_react_streamfield"):
+            code = frame.f_code
+            if module not in _SKIPPED_MODULES and code.co_name not in _COMPREHENSIONS:
+                functions.append(getattr(code, "co_qualname", code.co_name))
+        elif not module.startswith("django.") or not functions:
+            break
+        frame = frame.f_back
+    code_path = " > ".join(reversed(functions))
+    if frame is not None:
+        code_path += ", called from %s:%d in %s" % (
+            frame.f_code.co_filename,
+            frame.f_lineno,
+            frame.f_code.co_name,
+        )
+    return code_path
+
+
+class ChooserQueryTracker:
+    """
+    Counts the objects that chooser blocks fetch one by one, per target model.
+    When there are more than `limit` of a model, the chooser blocks and the code
+    paths that fetched them are reported with a ChooserQueryWarning, or with
+    a TooManyChooserQueries exception if `error` is true.
+    """
+
+    def __init__(self, limit=None, error=False):
+        self.limit = limit
+        self.error = error
+        self.counts = Counter()
+        # target model => Counter of (block path, method, code path).
+        self.sources = {}
+        self.reported = set()
+
+    def record(self, block, method, frame):
+        model = block.target_model
+        self.counts[model] += 1
+        key = (get_block_path(block), method, get_code_path(frame))
+        self.sources.setdefault(model, Counter())[key] += 1
+        if (
+            self.limit is not None
+            and self.counts[model] > self.limit
+            and model not in self.reported
+        ):
+            self.reported.add(model)
+            self.report(model)
+
+    def get_message(self, model):
+        lines = [
+            "%d %s were fetched one by one by chooser blocks, bypassing bulk loading "
+            "(limit: %d):"
+            % (
+                self.counts[model],
+                model._meta.verbose_name_plural,
+                self.limit,
+            )
+        ]
+        for (block_path, method, code_path), count in self.sources[model].most_common():
+            lines.append(
+                "  %s: %d by %s, via %s" % (block_path, count, method, code_path)
+            )
+        return "\n".join(lines)
+
+    def report(self, model):
+        message = self.get_message(model)
+        if self.error:
+            raise TooManyChooserQueries(message)
+        warnings.warn(message, ChooserQueryWarning)
+
+
+def record_chooser_query(block, method):
+    """
+    Called by chooser blocks before fetching an object one by one.
+    """
+    tracker = chooser_query_tracker.get()
+    if tracker is not None:
+        tracker.record(block, method, sys._getframe(1))
+
+
+def get_chooser_query_limit():
+    return getattr(settings, "STREAMFIELD_CHOOSER_QUERY_LIMIT", None)
+
+
+@contextmanager
+def track_chooser_queries(limit=None, error=None):
+    """
+    Track the objects fetched one by one by chooser blocks within the block,
+    reporting them past `limit` per model, the STREAMFIELD_CHOOSER_QUERY_LIMIT
+    setting by default. `error` defaults to the STREAMFIELD_CHOOSER_QUERY_ERROR
+    setting. The tracker is returned:
+
+        with track_chooser_queries(limit=0) as tracker:
+            str(page.body)
+        print(tracker.counts)
+    """
+    if limit is None:
+        limit = get_chooser_query_limit()
+    if error is None:
+        error = getattr(settings, "STREAMFIELD_CHOOSER_QUERY_ERROR", False)
+    tracker = ChooserQueryTracker(limit, error)
+    token = chooser_query_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        chooser_query_tracker.reset(token)
+
+
+class ChooserQueryMiddleware:
+    """
+    Tracks the objects fetched one by one by chooser blocks during each request,
+    if the STREAMFIELD_CHOOSER_QUERY_LIMIT setting is set.
+    """
+
+    def __init__(self, get_response):
+        if get_chooser_query_limit() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with track_chooser_queries():
+            return self.get_response(request)
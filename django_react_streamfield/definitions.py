@@ -0,0 +1,99 @@
+import hashlib
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.db.migrations.serializer import serializer_factory
+from django.utils import translation
+
+from . import __version__
+from .codecs import get_codec
+from .fields import StreamField
+from .widgets import ConfigJSONEncoder
+
+__all__ = [
+    "compile_definitions",
+    "get_child_definitions",
+    "get_schema_hash",
+    "load_compiled_definitions",
+]
+
+
+# (definition prefix of a StreamBlock, language) => definitions of its child blocks,
+# loaded from the STREAMFIELD_DEFINITIONS_FILE artifact.
+_compiled_definitions = {}
+
+
+def get_schema_hash(stream_block):
+    """
+    Return a hash of the schema of a StreamBlock, as it is written in migrations.
+    """
+    serialized, _imports = serializer_factory(stream_block).serialize()
+    return hashlib.sha1(("%s\n%s" % (__version__, serialized)).encode()).hexdigest()
+
+
+def get_child_definitions(stream_block):
+    """
+    Return the definitions of the child blocks of a StreamBlock in the active language,
+    precompiled by the streamfield_compile_definitions command if they are available.
+    """
+    try:
+        return _compiled_definitions[
+            (stream_block.definition_prefix, translation.get_language())
+        ]
+    except KeyError:
+        return stream_block.definition["children"]
+
+
+def get_stream_fields():
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, StreamField) and field.model is model:
+                yield "%s.%s" % (model._meta.label_lower, field.name), field
+
+
+def compile_definitions(languages=None):
+    """
+    Render the child block definitions of every StreamField in the given languages
+    (by default, those of the LANGUAGES setting) and return them as a dict of
+    "app_label.model_name.field_name" => {"hash": schema hash,
+    "definitions": {language: definitions}}.
+    """
+    if languages is None:
+        languages = [code for code, name in settings.LANGUAGES]
+    compiled = {}
+    for key, field in get_stream_fields():
+        definitions = {}
+        for language in languages:
+            with translation.override(language):
+                definitions[language] = field.stream_block.definition["children"]
+        # Encode and decode the definitions, so that they are plain JSON data.
+        codec = get_codec()
+        compiled[key] = {
+            "hash": get_schema_hash(field.stream_block),
+            "definitions": codec.loads(codec.dumps(definitions, cls=ConfigJSONEncoder)),
+        }
+    return compiled
+
+
+def load_compiled_definitions(path=None):
+    """
+    Load the definitions compiled to the STREAMFIELD_DEFINITIONS_FILE file, or `path`.
+    The definitions of StreamFields whose schema changed since are ignored,
+    and rendered on demand instead.
+    """
+    if path is None:
+        path = getattr(settings, "STREAMFIELD_DEFINITIONS_FILE", None)
+    if path is None or not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        compiled = get_codec().loads(f.read())
+    for key, field in get_stream_fields():
+        if key not in compiled:
+            continue
+        if compiled[key]["hash"] != get_schema_hash(field.stream_block):
+            continue
+        for language, definitions in compiled[key]["definitions"].items():
+            _compiled_definitions[(field.stream_block.definition_prefix, language)] = (
+                definitions
+            )
@@ -1,2 +1,10 @@
 class RemovedError(Exception):
     pass
+
+
+class ChooserQueryWarning(RuntimeWarning):
+    pass
+
+
+class TooManyChooserQueries(Exception):
+    pass
@@ -1,10 +1,13 @@
-import json
-
-from django.core.serializers.json import DjangoJSONEncoder
-from django.db import models
+from django.conf import settings
+from django.core import checks
+from django.db import connections, models, router
 
 from .blocks import Block, BlockField, StreamBlock, StreamValue
+from .blocks.stream_block import DeferredStreamData
+from .checks import check_block_tree
+from .codecs import get_codec
 from .exceptions import RemovedError
+from .lookups import BlockCount, HasBlock, References
 
 
 # https://github.com/django/django/blob/64200c14e0072ba0ffef86da46b2ea82fd1e019a/django/db/models/fields/subclassing.py#L31-L44
@@ -22,8 +25,13 @@ class Creator:
         field_name = self.field.name
 
         if field_name not in obj.__dict__:
-            # Field is deferred. Fetch it from db.
-            obj.refresh_from_db(fields=[field_name])
+            # Field is deferred. Fetch it from db, for all the instances
+            # fetched along with this one if a StreamFieldQuerySet fetched it.
+            batch = obj.__dict__.get("_stream_field_batch")
+            if batch is not None:
+                batch.load(field_name)
+            if field_name not in obj.__dict__:
+                obj.refresh_from_db(fields=[field_name])
         return obj.__dict__[field_name]
 
     def __set__(self, obj, value):
@@ -31,7 +39,13 @@ class Creator:
 
 
 class StreamField(models.Field):
-    def __init__(self, block_types, **kwargs):
+    def __init__(self, block_types, use_json_field=False, **kwargs):
+        """
+        If use_json_field is True, the value is stored in a JSON column
+        on the databases that have one, such as jsonb on PostgreSQL, which
+        the has_block, block_count and references lookups can use indexes of.
+        """
+        self.use_json_field = use_json_field
         super().__init__(**kwargs)
         if isinstance(block_types, Block):
             self.stream_block = block_types
@@ -41,7 +55,7 @@ class StreamField(models.Field):
             self.stream_block = StreamBlock(block_types, required=not self.blank)
 
     def get_internal_type(self):
-        return "TextField"
+        return "JSONField" if self.use_json_field else "TextField"
 
     def get_panel(self):
         raise RemovedError
@@ -50,6 +64,8 @@ class StreamField(models.Field):
         name, path, _, kwargs = super().deconstruct()
         block_types = list(self.stream_block.child_blocks.items())
         args = [block_types]
+        if self.use_json_field:
+            kwargs["use_json_field"] = True
         return name, path, args, kwargs
 
     def to_python(self, value):
@@ -58,8 +74,22 @@ class StreamField(models.Field):
         elif isinstance(value, StreamValue):
             return value
         elif isinstance(value, str):
+            if getattr(settings, "STREAMFIELD_DEFERRED_DECODING", False):
+                # Leave the JSON string undecoded, StreamValue decodes its children
+                # one at a time as they are accessed.
+                try:
+                    stream_data = DeferredStreamData(
+                        value, self.stream_block.child_blocks
+                    )
+                except ValueError:
+                    # Not a JSON array, handled below.
+                    pass
+                else:
+                    return StreamValue(
+                        self.stream_block, stream_data, is_lazy=True, raw_json=value
+                    )
             try:
-                unpacked_value = json.loads(value)
+                unpacked_value = get_codec().loads(value)
             except ValueError:
                 # value is not valid JSON; most likely, this field was previously a
                 # rich text field before being migrated to StreamField, and the data
@@ -74,7 +104,15 @@ class StreamField(models.Field):
                 # but better to handle it just in case...
                 return StreamValue(self.stream_block, [])
 
-            return self.stream_block.to_python(unpacked_value)
+            stream_value = self.stream_block.to_python(unpacked_value)
+            if isinstance(stream_value, StreamValue) and len(stream_value) == len(
+                unpacked_value
+            ):
+                # Keep the JSON string, so that the value can be saved back as is
+                # if it does not change. Values that dropped unknown block types
+                # have to be serialised again.
+                stream_value.raw_json = value
+            return stream_value
         else:
             # See if it looks like the standard non-smart representation of a
             # StreamField value: a list of (block_name, value) tuples
@@ -101,12 +139,16 @@ class StreamField(models.Field):
             # for reverse migrations that convert StreamField data back into plain text
             # fields.)
             return value.raw_text
+        elif isinstance(value, StreamValue) and not value.dirty:
+            # The value is unchanged since it was loaded, write it back as is.
+            return value.raw_json
         else:
-            return json.dumps(
-                self.stream_block.get_prep_value(value), cls=DjangoJSONEncoder
-            )
+            return get_codec().dumps(self.stream_block.get_prep_value(value))
 
     def from_db_value(self, value, expression, connection):
+        if isinstance(value, list):
+            # Already decoded by the database adapter of a JSON column.
+            return self.stream_block.to_python(value)
         return self.to_python(value)
 
     def formfield(self, **kwargs):
@@ -128,6 +170,26 @@ class StreamField(models.Field):
     def check(self, **kwargs):
         errors = super().check(**kwargs)
         errors.extend(self.stream_block.check(field=self, **kwargs))
+        errors.extend(check_block_tree(self.stream_block, self))
+        if self.use_json_field:
+            errors.extend(self._check_json_field_supported(kwargs.get("databases")))
+        return errors
+
+    def _check_json_field_supported(self, databases):
+        errors = []
+        for db in databases or []:
+            if not router.allow_migrate_model(db, self.model):
+                continue
+            connection = connections[db]
+            if not connection.features.supports_json_field:
+                errors.append(
+                    checks.Error(
+                        "%s does not support JSON columns, required by "
+                        "use_json_field." % connection.display_name,
+                        obj=self,
+                        id="streamfield.E001",
+                    )
+                )
         return errors
 
     def contribute_to_class(self, cls, name, **kwargs):
@@ -136,3 +198,8 @@ class StreamField(models.Field):
         # Add Creator descriptor to allow the field to be set from a list or a
         # JSON string.
         setattr(cls, self.name, Creator(self))
+
+
+StreamField.register_lookup(HasBlock)
+StreamField.register_lookup(BlockCount)
+StreamField.register_lookup(References)
@@ -0,0 +1,25 @@
+from django import forms
+
+from .blocks import BlockField, StreamValue
+
+__all__ = ["StreamFieldFormMixin", "StreamFieldModelForm"]
+
+
+class StreamFieldFormMixin:
+    """
+    Gives the StreamFields of a form the value they are edited from (their initial
+    value, such as the value of the instance of a ModelForm), so that the editor can
+    submit its changes to that value instead of the whole StreamField.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, field in self.fields.items():
+            if isinstance(field, BlockField):
+                value = self.get_initial_for_field(field, name)
+                if isinstance(value, StreamValue):
+                    field.previous_value = field.widget.previous_value = value
+
+
+class StreamFieldModelForm(StreamFieldFormMixin, forms.ModelForm):
+    pass
@@ -0,0 +1,244 @@
+import datetime
+import math
+import random
+import uuid
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+
+from django import forms
+from django.conf import settings
+from django.utils import timezone
+
+from .blocks import (
+    BaseStreamBlock,
+    BaseStructBlock,
+    ChooserBlock,
+    FieldBlock,
+    ListBlock,
+    StaticBlock,
+)
+
+__all__ = ["StreamGenerator"]
+
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat"
+).split()
+
+
+class StreamGenerator:
+    """
+    Generates random valid raw values for blocks, such as the value of a StreamField
+    as it is stored in the database. Generators created with the same seed
+    generate the same values, given the same rows to choose from.
+
+    The number of children of streams and lists is picked in the given (min, max)
+    ranges, within the min_num, max_num and block_counts of the block.
+    Chooser blocks choose among the objects of the queryset of their form field.
+    If there are none, the callable `object_factories[target_model]`, if given,
+    is called with the generator to create `objects_per_model` of them.
+    """
+
+    def __init__(
+        self,
+        seed=None,
+        stream_length=(1, 20),
+        child_stream_length=(1, 5),
+        list_length=(1, 5),
+        object_factories=None,
+        objects_per_model=10,
+    ):
+        self.random = random.Random(seed)
+        self.stream_length = stream_length
+        self.child_stream_length = child_stream_length
+        self.list_length = list_length
+        self.object_factories = object_factories or {}
+        self.objects_per_model = objects_per_model
+        # id(chooser block) => primary keys of the objects it can choose.
+        self._chooser_pks = {}
+
+    def generate_stream_value(self, stream_block):
+        """
+        Return a random StreamValue of `stream_block`.
+        """
+        return stream_block.to_python(self.generate(stream_block))
+
+    def generate(self, block, length=None):
+        """
+        Return a random raw value of `block`. `length` is the range of the number of
+        children if it is a StreamBlock, `stream_length` by default.
+        """
+        if isinstance(block, BaseStreamBlock):
+            return self.generate_stream(block, length or self.stream_length)
+        if isinstance(block, BaseStructBlock):
+            return {
+                name: self.generate(child_block, self.child_stream_length)
+                for name, child_block in block.child_blocks.items()
+            }
+        if isinstance(block, ListBlock):
+            size = self.pick_length(
+                self.list_length, block.meta.min_num, block.meta.max_num
+            )
+            return [
+                self.generate(block.child_block, self.child_stream_length)
+                for _ in range(size)
+            ]
+        if isinstance(block, ChooserBlock):
+            return self.choose_object(block)
+        if isinstance(block, FieldBlock):
+            return self.generate_field_value(block)
+        if isinstance(block, StaticBlock):
+            return None
+        return block.get_prep_value(block.get_default())
+
+    def generate_id(self):
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    def pick_length(self, length, min_num=None, max_num=None, required=False):
+        low, high = length
+        if min_num is not None:
+            low, high = max(low, min_num), max(high, min_num)
+        elif required:
+            low, high = max(low, 1), max(high, 1)
+        if max_num is not None:
+            low, high = min(low, max_num), min(high, max_num)
+        return self.random.randint(low, high)
+
+    def generate_stream(self, block, length):
+        block_counts = block.meta.block_counts or {}
+        # The children that block_counts requires.
+        block_types = [
+            name
+            for name, counts in block_counts.items()
+            for _ in range(counts.get("min_num") or 0)
+        ]
+        size = self.pick_length(
+            length,
+            max(block.meta.min_num or 0, len(block_types)) or None,
+            block.meta.max_num,
+            block.required,
+        )
+        counts = {name: block_types.count(name) for name in block.child_blocks}
+        while len(block_types) < size:
+            available = [
+                name
+                for name in block.child_blocks
+                if block_counts.get(name, {}).get("max_num") is None
+                or counts[name] < block_counts[name]["max_num"]
+            ]
+            if not available:
+                break
+            name = self.random.choice(available)
+            counts[name] += 1
+            block_types.append(name)
+        self.random.shuffle(block_types)
+        return [
+            {
+                "type": name,
+                "value": self.generate(
+                    block.child_blocks[name], self.child_stream_length
+                ),
+                "id": self.generate_id(),
+            }
+            for name in block_types
+        ]
+
+    def choose_object(self, block):
+        if id(block) not in self._chooser_pks:
+            queryset = block.field.queryset
+            pks = list(queryset.order_by("pk").values_list("pk", flat=True))
+            factory = self.object_factories.get(block.target_model)
+            if not pks and factory is not None:
+                for _ in range(self.objects_per_model):
+                    obj = factory(self)
+                    if obj.pk is None:
+                        obj.save()
+                    pks.append(obj.pk)
+            self._chooser_pks[id(block)] = pks
+        pks = self._chooser_pks[id(block)]
+        if not pks:
+            if block.required:
+                raise ValueError(
+                    "There are no %s to choose from, create some or give "
+                    "a factory of them in object_factories."
+                    % block.target_model._meta.verbose_name_plural
+                )
+            return None
+        pk = self.random.choice(pks)
+        return str(pk) if isinstance(pk, uuid.UUID) else pk
+
+    def generate_text(self, min_length=None, max_length=None, words=(3, 12)):
+        text = " ".join(
+            self.random.choice(WORDS) for _ in range(self.random.randint(*words))
+        ).capitalize()
+        while min_length is not None and len(text) < min_length:
+            text += " " + self.random.choice(WORDS)
+        if max_length is not None:
+            text = text[:max_length].strip() or "x"
+        return text
+
+    def generate_field_value(self, block):
+        """
+        Return a random raw value of a FieldBlock, from the type and the constraints
+        of its form field.
+        """
+        field = block.field
+        if isinstance(field, forms.ChoiceField):
+            values = []
+            for value, label in field.choices:
+                if isinstance(label, (list, tuple)):
+                    # An optgroup.
+                    values.extend(choice for choice, _label in label if choice != "")
+                elif value != "":
+                    values.append(value)
+            return self.random.choice(values) if values else None
+        if isinstance(field, forms.BooleanField):
+            return True if field.required else self.random.random() < 0.5
+        if isinstance(field, (forms.IntegerField, forms.FloatField)):
+            low, high = field.min_value, field.max_value
+            if low is None:
+                low = 0 if high is None or high >= 0 else high - 1000
+            if high is None:
+                high = low + 1000
+            if isinstance(field, forms.DecimalField):
+                places = 2 if field.decimal_places is None else field.decimal_places
+                step = Decimal(1).scaleb(-places)
+                low, high = Decimal(low), Decimal(high)
+                if field.max_digits is not None:
+                    # The largest value with no more than max_digits digits.
+                    limit = Decimal(10) ** (field.max_digits - places) - step
+                    low, high = max(low, -limit), min(high, limit)
+                low = low.quantize(step, rounding=ROUND_CEILING)
+                high = high.quantize(step, rounding=ROUND_FLOOR)
+                value = Decimal(self.random.uniform(float(low), float(high)))
+                return str(min(max(value.quantize(step), low), high))
+            if isinstance(field, forms.FloatField):
+                return self.random.uniform(float(low), float(high))
+            return self.random.randint(math.ceil(low), math.floor(high))
+        if isinstance(field, forms.DateTimeField):
+            value = datetime.datetime(2020, 1, 1) + datetime.timedelta(
+                seconds=self.random.randrange(366 * 24 * 60 * 60)
+            )
+            if settings.USE_TZ:
+                value = timezone.make_aware(value, timezone.utc)
+            return value.isoformat()
+        if isinstance(field, forms.DateField):
+            value = datetime.date(2020, 1, 1) + datetime.timedelta(
+                days=self.random.randrange(366)
+            )
+            return value.isoformat()
+        if isinstance(field, forms.TimeField):
+            return datetime.time(
+                self.random.randrange(24), self.random.randrange(0, 60, 5)
+            ).isoformat()
+        if isinstance(field, forms.EmailField):
+            return "%s@example.com" % self.random.choice(WORDS)
+        if isinstance(field, forms.URLField):
+            return "https://example.com/%s/" % self.random.choice(WORDS)
+        if isinstance(field, forms.RegexField):
+            # No value can be generated from any regex, use the default.
+            return block.get_prep_value(block.get_default())
+        if isinstance(field, forms.CharField):
+            return self.generate_text(field.min_length, field.max_length)
+        return block.get_prep_value(block.get_default())
@@ -0,0 +1,323 @@
+import functools
+import inspect
+import logging
+import time
+import weakref
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.dispatch import Signal
+from django.utils.module_loading import import_string
+
+__all__ = [
+    "Aggregator",
+    "BlockCall",
+    "LoggingSink",
+    "SignalSink",
+    "add_sink",
+    "block_called",
+    "instrumented",
+    "remove_sink",
+]
+
+# The block methods that are instrumented, in every Block subclass defining them.
+INSTRUMENTED_METHODS = (
+    "to_python",
+    "bulk_to_python",
+    "bulk_resolve",
+    "bulk_fetch",
+    "render",
+    "clean",
+    "prepare_value",
+    "get_searchable_content",
+)
+
+logger = logging.getLogger("django_react_streamfield.instrumentation")
+
+# Sent by SignalSink for each instrumented call, with the BlockCall as `call`.
+block_called = Signal()
+
+# The sinks that instrumented calls are reported to. The block methods are only
+# instrumented while there is one, so that they cost nothing otherwise.
+_sinks = []
+
+# Every Block subclass, registered by the Block metaclass.
+_block_classes = weakref.WeakSet()
+
+# The _CallStack of the instrumented calls being run.
+_call_stack = ContextVar("block_call_stack", default=None)
+
+
+class BlockCall:
+    """
+    An instrumented call of a block method. `duration` (in seconds) and `queries`
+    include the calls of the nested blocks, `own_duration` and `own_queries`
+    do not.
+    """
+
+    def __init__(self, block, method):
+        self.block = block
+        self.method = method
+        self.duration = 0.0
+        self.queries = 0
+        self.own_duration = 0.0
+        self.own_queries = 0
+
+    @property
+    def block_name(self):
+        return self.block.name
+
+    @property
+    def block_class(self):
+        block_class = type(self.block)
+        return "%s.%s" % (block_class.__module__, block_class.__qualname__)
+
+    def __repr__(self):
+        return "<BlockCall %s %r.%s %.3f ms, %d queries>" % (
+            self.block_class,
+            self.block_name,
+            self.method,
+            self.duration * 1000,
+            self.queries,
+        )
+
+
+class _CallStack:
+    def __init__(self):
+        self.frames = []
+        # Queries made since the outermost call started.
+        self.queries = 0
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def _run_instrumented(method, block, args, kwargs):
+    stack = _call_stack.get()
+    if stack is None:
+        stack = _CallStack()
+        token = _call_stack.set(stack)
+        with ExitStack() as wrappers:
+            for connection in connections.all():
+                wrappers.enter_context(connection.execute_wrapper(stack.count_query))
+            try:
+                return _run_frame(stack, method, block, args, kwargs)
+            finally:
+                _call_stack.reset(token)
+    frame = stack.frames[-1]
+    if frame[0].block is block and frame[0].method == method.__name__:
+        # A call of the method of a parent class, with super().
+        return method(block, *args, **kwargs)
+    return _run_frame(stack, method, block, args, kwargs)
+
+
+def _run_frame(stack, method, block, args, kwargs):
+    call = BlockCall(block, method.__name__)
+    # The call, and the duration and queries of the nested calls.
+    frame = [call, 0.0, 0]
+    stack.frames.append(frame)
+    start_queries = stack.queries
+    start = time.perf_counter()
+    try:
+        return method(block, *args, **kwargs)
+    finally:
+        call.duration = time.perf_counter() - start
+        call.queries = stack.queries - start_queries
+        call.own_duration = call.duration - frame[1]
+        call.own_queries = call.queries - frame[2]
+        stack.frames.pop()
+        if stack.frames:
+            parent = stack.frames[-1]
+            parent[1] += call.duration
+            parent[2] += call.queries
+        for sink in _sinks:
+            sink(call)
+
+
+def instrument(method):
+    """
+    Decorate a block method to report its calls to the sinks.
+    """
+
+    @functools.wraps(method)
+    def wrapper(block, *args, **kwargs):
+        if not _sinks:
+            return method(block, *args, **kwargs)
+        return _run_instrumented(method, block, args, kwargs)
+
+    wrapper.instrumented_method = method
+    return wrapper
+
+
+def instrument_class(cls):
+    for name in INSTRUMENTED_METHODS:
+        method = cls.__dict__.get(name)
+        if (
+            inspect.isfunction(method)
+            and not inspect.iscoroutinefunction(method)
+            and not hasattr(method, "instrumented_method")
+        ):
+            setattr(cls, name, instrument(method))
+
+
+def uninstrument_class(cls):
+    for name in INSTRUMENTED_METHODS:
+        method = cls.__dict__.get(name)
+        if hasattr(method, "instrumented_method"):
+            setattr(cls, name, method.instrumented_method)
+
+
+def register_block_class(cls):
+    """
+    Called by the Block metaclass for each Block subclass.
+    """
+    _block_classes.add(cls)
+    if _sinks:
+        instrument_class(cls)
+
+
+def add_sink(sink):
+    """
+    Report the calls of the instrumented block methods to `sink`, a callable
+    taking a BlockCall.
+    """
+    if not _sinks:
+        for cls in list(_block_classes):
+            instrument_class(cls)
+    _sinks.append(sink)
+
+
+def remove_sink(sink):
+    _sinks.remove(sink)
+    if not _sinks:
+        for cls in list(_block_classes):
+            uninstrument_class(cls)
+
+
+@contextmanager
+def instrumented(*sinks):
+    """
+    Report the block calls made within the block to `sinks`, an Aggregator
+    by default, which is returned:
+
+        with instrumented() as stats:
+            page.body.render_as_block()
+        print(stats.report())
+
+    The sinks also get the calls made by other threads meanwhile.
+    """
+    sinks = sinks or (Aggregator(),)
+    for sink in sinks:
+        add_sink(sink)
+    try:
+        yield sinks[0]
+    finally:
+        for sink in sinks:
+            remove_sink(sink)
+
+
+class SignalSink:
+    """
+    Sends the block_called signal for each call, with the block class as sender.
+    """
+
+    def __call__(self, call):
+        block_called.send(sender=type(call.block), call=call)
+
+
+class LoggingSink:
+    """
+    Logs each call at the DEBUG level or, if `threshold` is given, the calls
+    whose own duration (not counting nested blocks) reaches `threshold` seconds
+    as warnings.
+    """
+
+    def __init__(self, threshold=None, logger=logger):
+        self.threshold = threshold
+        self.logger = logger
+
+    def __call__(self, call):
+        if self.threshold is None:
+            level = logging.DEBUG
+        elif call.own_duration >= self.threshold:
+            level = logging.WARNING
+        else:
+            return
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level,
+            "%s %r.%s took %.1f ms (%.1f ms in nested blocks), %d queries "
+            "(%d in nested blocks).",
+            call.block_class,
+            call.block_name,
+            call.method,
+            call.duration * 1000,
+            (call.duration - call.own_duration) * 1000,
+            call.queries,
+            call.queries - call.own_queries,
+        )
+
+
+class Aggregator:
+    """
+    Sums up the calls per block class, block name and method.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def __call__(self, call):
+        key = (call.block_class, call.block_name, call.method)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = {
+                "calls": 0,
+                "duration": 0.0,
+                "own_duration": 0.0,
+                "queries": 0,
+                "own_queries": 0,
+            }
+        stats["calls"] += 1
+        stats["duration"] += call.duration
+        stats["own_duration"] += call.own_duration
+        stats["queries"] += call.queries
+        stats["own_queries"] += call.own_queries
+
+    def reset(self):
+        self.stats = {}
+
+    def report(self):
+        """
+        Return the stats as a list of dicts, by decreasing own duration.
+        """
+        rows = [
+            {"block_class": block_class, "block_name": block_name, "method": method}
+            for block_class, block_name, method in self.stats
+        ]
+        for row, stats in zip(rows, self.stats.values()):
+            row.update(stats)
+        return sorted(rows, key=lambda row: row["own_duration"], reverse=True)
+
+
+def configure_sinks():
+    """
+    Add the sinks of the STREAMFIELD_INSTRUMENTATION_SINKS setting, dotted paths
+    to sink classes, and a LoggingSink if STREAMFIELD_SLOW_BLOCK_THRESHOLD is set.
+    """
+    for path in getattr(settings, "STREAMFIELD_INSTRUMENTATION_SINKS", ()):
+        try:
+            sink_class = import_string(path)
+        except ImportError as e:
+            raise ImproperlyConfigured(
+                "Could not import the StreamField instrumentation sink %r: %s"
+                % (path, e)
+            )
+        add_sink(sink_class())
+    threshold = getattr(settings, "STREAMFIELD_SLOW_BLOCK_THRESHOLD", None)
+    if threshold is not None:
+        add_sink(LoggingSink(threshold=threshold))
@@ -0,0 +1,168 @@
+from django.core.exceptions import EmptyResultSet
+from django.db import NotSupportedError
+from django.db.models import Func, IntegerField, Lookup, Transform
+
+from .codecs import get_codec
+
+__all__ = ["BlockCount", "HasBlock", "References"]
+
+
+def is_json_field(field):
+    return field.get_internal_type() == "JSONField"
+
+
+def sqlite_contains(document, document_params, path, path_params, pattern, aliases):
+    """
+    Compile the containment of `pattern` by the JSON value at `path` in
+    `document` to SQLite JSON1 functions, as PostgreSQL's @> operator.
+    Paths are always taken from `document`, so nested values are not parsed again.
+    """
+    sqls, params = [], []
+    if isinstance(pattern, dict):
+        for key, value in pattern.items():
+            sql, value_params = sqlite_contains(
+                document,
+                document_params,
+                "(%s || %%s)" % path,
+                [*path_params, '."%s"' % key],
+                value,
+                aliases,
+            )
+            sqls.append(sql)
+            params.extend(value_params)
+    elif isinstance(pattern, list):
+        for value in pattern:
+            alias = "streamfield_each_%d" % len(aliases)
+            aliases.append(alias)
+            sql, value_params = sqlite_contains(
+                document, document_params, "%s.fullkey" % alias, [], value, aliases
+            )
+            sqls.append(
+                "EXISTS (SELECT 1 FROM JSON_EACH(%s, %s) AS %s WHERE %s)"
+                % (document, path, alias, sql)
+            )
+            params.extend([*document_params, *path_params, *value_params])
+    else:
+        sqls.append("JSON_EXTRACT(%s, %s) = %%s" % (document, path))
+        params.extend([*document_params, *path_params, pattern])
+    return " AND ".join(sqls) or "1 = 1", params
+
+
+class StreamContains(Lookup):
+    """
+    Base class of the lookups matching StreamFields whose stored data contains
+    one of the JSON patterns returned by get_patterns().
+    """
+
+    prepare_rhs = False
+
+    def get_patterns(self):
+        raise NotImplementedError
+
+    def get_prepared_patterns(self):
+        codec = get_codec()
+        # Serialise and decode the patterns, so that primary keys and such
+        # are compared with the form they are stored in.
+        patterns = codec.loads(codec.dumps(self.get_patterns()))
+        if not patterns:
+            raise EmptyResultSet
+        return patterns
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError(
+            "The %r lookup of StreamField is not supported on %s."
+            % (self.lookup_name, connection.display_name)
+        )
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        if not is_json_field(self.lhs.output_field):
+            lhs = "(%s)::jsonb" % lhs
+        codec = get_codec()
+        patterns = self.get_prepared_patterns()
+        sql = " OR ".join("%s @> %%s::jsonb" % lhs for pattern in patterns)
+        params = []
+        for pattern in patterns:
+            params.extend([*lhs_params, codec.dumps(pattern)])
+        return "(%s)" % sql, params
+
+    def as_mysql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        codec = get_codec()
+        patterns = self.get_prepared_patterns()
+        sql = " OR ".join("JSON_CONTAINS(%s, %%s)" % lhs for pattern in patterns)
+        params = []
+        for pattern in patterns:
+            params.extend([*lhs_params, codec.dumps(pattern)])
+        return "(%s)" % sql, params
+
+    def as_sqlite(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        sqls, params = [], []
+        for pattern in self.get_prepared_patterns():
+            sql, pattern_params = sqlite_contains(
+                lhs, lhs_params, "%s", ["$"], pattern, []
+            )
+            sqls.append(sql)
+            params.extend(pattern_params)
+        return "(%s)" % " OR ".join(sqls), params
+
+
+class HasBlock(StreamContains):
+    """
+    `body__has_block="image"` matches the rows whose StreamField has
+    a child of the "image" block type.
+    """
+
+    lookup_name = "has_block"
+
+    def get_patterns(self):
+        return [[{"type": self.rhs}]]
+
+
+class References(StreamContains):
+    """
+    `body__references=image` matches the rows whose StreamField has a chooser block,
+    at any depth, that refers to `image`.
+    """
+
+    lookup_name = "references"
+
+    def get_patterns(self):
+        return self.lhs.output_field.stream_block.get_reference_patterns(self.rhs)
+
+
+class BlockCount(Transform):
+    """
+    The number of children of a StreamField, as in `body__block_count__gt=10`.
+    Can also be used as an expression, for instance in an index:
+    `models.Index(BlockCount("body"), name="page_body_block_count")`.
+    """
+
+    lookup_name = "block_count"
+    output_field = IntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            "The block_count transform of StreamField is not supported on %s."
+            % connection.display_name
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        if is_json_field(self.lhs.output_field):
+            template = "JSONB_ARRAY_LENGTH(%(expressions)s)"
+        else:
+            template = "JSONB_ARRAY_LENGTH((%(expressions)s)::jsonb)"
+        return Func.as_sql(
+            self, compiler, connection, template=template, **extra_context
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return Func.as_sql(
+            self, compiler, connection, function="JSON_LENGTH", **extra_context
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return Func.as_sql(
+            self, compiler, connection, function="JSON_ARRAY_LENGTH", **extra_context
+        )
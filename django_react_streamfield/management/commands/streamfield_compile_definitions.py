@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...codecs import get_codec
+from ...definitions import compile_definitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the block definitions of every StreamField in every language "
+        "to the STREAMFIELD_DEFINITIONS_FILE file, so that workers load them "
+        "at startup instead of rendering them on the first admin request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="The file to write, instead of the STREAMFIELD_DEFINITIONS_FILE one.",
+        )
+        parser.add_argument(
+            "--language",
+            action="append",
+            dest="languages",
+            help="A language to render the definitions in, instead of those "
+            "of the LANGUAGES setting. Can be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["output"] or getattr(
+            settings, "STREAMFIELD_DEFINITIONS_FILE", None
+        )
+        if path is None:
+            raise CommandError(
+                "Set the STREAMFIELD_DEFINITIONS_FILE setting or pass --output."
+            )
+        compiled = compile_definitions(languages=options["languages"])
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(get_codec().dumps(compiled))
+        self.stdout.write(
+            "Compiled the definitions of %d StreamFields to %s." % (len(compiled), path)
+        )
@@ -0,0 +1,87 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from ...codecs import get_codec
+from ...fields import StreamField
+from ...generators import StreamGenerator
+
+
+def length_range(value):
+    low, _, high = value.partition(",")
+    return int(low), int(high or low)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create rows of a model with random StreamField values, to benchmark "
+        "or load-test with production-scale data. The other fields of the rows "
+        "take their default value."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", metavar="app_label.ModelName")
+        parser.add_argument("count", type=int, help="The number of rows to create.")
+        parser.add_argument(
+            "--field",
+            action="append",
+            dest="fields",
+            help="A StreamField to fill, instead of all the StreamFields "
+            "of the model. Can be repeated.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="The seed of the random generator, to create the same values again.",
+        )
+        parser.add_argument(
+            "--stream-length",
+            type=length_range,
+            default=(1, 20),
+            metavar="MIN,MAX",
+            help="The range of the number of children of each StreamField.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="The number of rows created at a time.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if isinstance(field, StreamField)
+            and (options["fields"] is None or field.name in options["fields"])
+        ]
+        if not fields:
+            raise CommandError("%s has no such StreamField." % model._meta.label)
+
+        generator = StreamGenerator(
+            seed=options["seed"], stream_length=options["stream_length"]
+        )
+        codec = get_codec()
+        count = options["count"]
+        batch_size = options["batch_size"]
+        created = 0
+        while created < count:
+            instances = []
+            for _ in range(min(batch_size, count - created)):
+                instance = model()
+                for field in fields:
+                    # Set as JSON, so that it is saved as is.
+                    setattr(
+                        instance,
+                        field.attname,
+                        codec.dumps(generator.generate(field.stream_block)),
+                    )
+                instances.append(instance)
+            model._default_manager.bulk_create(instances)
+            created += len(instances)
+            if options["verbosity"] > 1:
+                self.stdout.write("Created %d of %d rows." % (created, count))
+        self.stdout.write("Created %d %s." % (created, model._meta.label))
@@ -0,0 +1,133 @@
+import weakref
+
+from django.db import models
+from django.db.models.query import ModelIterable
+
+from .blocks import prefetch_stream_values
+from .fields import StreamField
+
+__all__ = ["DeferredStreamBatch", "StreamFieldQuerySet", "prefetch_stream_objects"]
+
+
+def prefetch_stream_objects(model_instances, *field_names):
+    """
+    Prefetch, for the given StreamFields of all the model instances at once,
+    the objects that chooser blocks refer to; see prefetch_stream_values.
+    Fields that were deferred are skipped.
+    """
+    prefetch_stream_values(
+        instance.__dict__[field_name]
+        for instance in model_instances
+        for field_name in field_names
+        if field_name in instance.__dict__
+    )
+
+
+class DeferredStreamBatch:
+    """
+    The model instances fetched together by a StreamFieldQuerySet, so that the first
+    access to a deferred StreamField of one of them loads the field for all of them
+    with a single query.
+
+    Only weak references to the instances are kept, and the batch is dropped
+    when an instance is pickled.
+    """
+
+    def __init__(self, instances, prefetch_stream_fields=()):
+        self.instances = [weakref.ref(instance) for instance in instances]
+        self.prefetch_stream_fields = prefetch_stream_fields
+
+    def __reduce__(self):
+        return (DeferredStreamBatch, ([],))
+
+    def load(self, field_name):
+        instances = [
+            instance
+            for instance in (ref() for ref in self.instances)
+            if instance is not None
+            and instance.pk is not None
+            and field_name not in instance.__dict__
+        ]
+        if not instances:
+            return
+        model = type(instances[0])
+        values = dict(
+            model._base_manager.using(instances[0]._state.db)
+            .filter(pk__in={instance.pk for instance in instances})
+            .values_list("pk", field_name)
+        )
+        loaded = []
+        for instance in instances:
+            if instance.pk in values:
+                setattr(instance, field_name, values[instance.pk])
+                loaded.append(instance)
+        if field_name in self.prefetch_stream_fields:
+            prefetch_stream_objects(loaded, field_name)
+
+
+class StreamFieldQuerySet(models.QuerySet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prefetch_stream_fields = ()
+        self._prefetch_stream_done = False
+        self._deferred_stream_batch_done = False
+
+    def prefetch_stream(self, *field_names):
+        """
+        Return a new QuerySet that, when evaluated, converts the chooser blocks
+        of the given StreamFields for all the fetched rows at once, with a single query
+        per model.
+
+        When prefetch_stream(None) is called, the list of fields is cleared.
+        """
+        clone = self._chain()
+        if field_names == (None,):
+            clone._prefetch_stream_fields = ()
+        else:
+            for field_name in field_names:
+                if not isinstance(self.model._meta.get_field(field_name), StreamField):
+                    raise ValueError("'%s' is not a StreamField." % field_name)
+            clone._prefetch_stream_fields += field_names
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._prefetch_stream_fields = self._prefetch_stream_fields
+        return clone
+
+    def _fetch_all(self):
+        super()._fetch_all()
+        if (
+            self._prefetch_stream_fields
+            and not self._prefetch_stream_done
+            and issubclass(self._iterable_class, ModelIterable)
+        ):
+            prefetch_stream_objects(self._result_cache, *self._prefetch_stream_fields)
+            self._prefetch_stream_done = True
+        if (
+            not self._deferred_stream_batch_done
+            and len(self._result_cache) > 1
+            and issubclass(self._iterable_class, ModelIterable)
+        ):
+            self._add_deferred_stream_batch()
+            self._deferred_stream_batch_done = True
+
+    def _add_deferred_stream_batch(self):
+        """
+        Let the instances load their deferred StreamFields together, see
+        DeferredStreamBatch.
+        """
+        stream_fields = [
+            field
+            for field in self.model._meta.concrete_fields
+            if isinstance(field, StreamField)
+        ]
+        instances = [
+            instance
+            for instance in self._result_cache
+            if any(field.attname not in instance.__dict__ for field in stream_fields)
+        ]
+        if len(instances) > 1:
+            batch = DeferredStreamBatch(instances, self._prefetch_stream_fields)
+            for instance in instances:
+                instance._stream_field_batch = batch
@@ -0,0 +1 @@
+default_app_config = "django_react_streamfield.references.apps.StreamReferencesConfig"
@@ -0,0 +1,21 @@
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_save
+
+
+class StreamReferencesConfig(AppConfig):
+    default_auto_field = "django.db.models.AutoField"
+    name = "django_react_streamfield.references"
+    label = "streamfield_references"
+    verbose_name = "StreamField references"
+
+    def ready(self):
+        from .index import (
+            delete_references_on_delete,
+            get_stream_fields,
+            update_references_on_save,
+        )
+
+        for model in apps.get_models():
+            if get_stream_fields(model):
+                post_save.connect(update_references_on_save, sender=model)
+                post_delete.connect(delete_references_on_delete, sender=model)
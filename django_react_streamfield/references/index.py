@@ -0,0 +1,95 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import router, transaction
+
+from ..blocks import StreamValue
+from ..codecs import get_codec
+from ..fields import StreamField
+from .models import StreamReference
+
+
+def get_stream_fields(model):
+    return [
+        field for field in model._meta.concrete_fields if isinstance(field, StreamField)
+    ]
+
+
+def get_references(field, value):
+    """
+    Return the set of (block path, target model, target pk) tuples
+    for the objects that the chooser blocks of a StreamField value refer to.
+    """
+    if isinstance(value, StreamValue) and not value.dirty:
+        # Read the stored data rather than converting the children.
+        data = get_codec().loads(value.raw_json)
+    else:
+        data = field.stream_block.get_prep_value(value)
+    return {
+        (".".join(path), model, str(pk))
+        for path, model, pk in field.stream_block.extract_references(data)
+    }
+
+
+def update_references(model, instances, field_names=None, batch_size=None, using=None):
+    """
+    Replace the references indexed for the StreamFields of `instances`,
+    instances of `model`, or only for the fields named in `field_names`,
+    in the database `using`, or the one the router writes StreamReferences to.
+    """
+    fields = [
+        field
+        for field in get_stream_fields(model)
+        if field_names is None or field.name in field_names
+    ]
+    if not fields or not instances:
+        return
+    if using is None:
+        using = router.db_for_write(StreamReference)
+    content_types = ContentType.objects.db_manager(using)
+    source_content_type = content_types.get_for_model(model)
+    references = []
+    for instance in instances:
+        for field in fields:
+            value = field.value_from_object(instance)
+            for block_path, target_model, target_pk in get_references(field, value):
+                references.append(
+                    StreamReference(
+                        source_content_type=source_content_type,
+                        source_object_id=str(instance.pk),
+                        field_name=field.name,
+                        block_path=block_path,
+                        target_content_type=content_types.get_for_model(target_model),
+                        target_object_id=target_pk,
+                    )
+                )
+    with transaction.atomic(using=using):
+        StreamReference.objects.using(using).filter(
+            source_content_type=source_content_type,
+            source_object_id__in=[str(instance.pk) for instance in instances],
+            field_name__in=[field.name for field in fields],
+        ).delete()
+        StreamReference.objects.using(using).bulk_create(
+            references, batch_size=batch_size
+        )
+
+
+def update_references_on_save(
+    sender, instance, created, update_fields, using, **kwargs
+):
+    field_names = []
+    for field in get_stream_fields(sender):
+        if update_fields is not None and field.name not in update_fields:
+            continue
+        if field.attname not in instance.__dict__:
+            # Deferred, so it was not saved.
+            continue
+        value = instance.__dict__[field.attname]
+        if not created and isinstance(value, StreamValue) and not value.dirty:
+            # Saved back as it was loaded, its references did not change.
+            continue
+        field_names.append(field.name)
+    if field_names:
+        update_references(sender, [instance], field_names, using=using)
+
+
+def delete_references_on_delete(sender, instance, using, **kwargs):
+    StreamReference.objects.using(using).filter(source=instance).delete()
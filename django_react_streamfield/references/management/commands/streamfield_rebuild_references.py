@@ -0,0 +1,57 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from ...index import get_stream_fields, update_references
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the StreamReference index from the stored StreamFields, "
+        "loading the rows of each model in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label.ModelName",
+            help="The models to index, instead of all the models with StreamFields.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="The number of rows loaded and indexed at a time.",
+        )
+
+    def handle(self, *args, **options):
+        if options["models"]:
+            try:
+                models = [apps.get_model(label) for label in options["models"]]
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+        else:
+            models = apps.get_models()
+        batch_size = options["batch_size"]
+        for model in models:
+            fields = get_stream_fields(model)
+            if not fields:
+                continue
+            queryset = model._base_manager.only(
+                *[field.name for field in fields]
+            ).order_by("pk")
+            count = 0
+            last_pk = None
+            while True:
+                batch = queryset
+                if last_pk is not None:
+                    batch = batch.filter(pk__gt=last_pk)
+                instances = list(batch[:batch_size])
+                if not instances:
+                    break
+                update_references(model, instances, batch_size=batch_size)
+                count += len(instances)
+                last_pk = instances[-1].pk
+            self.stdout.write(
+                "Indexed the references of %d %s." % (count, model._meta.label)
+            )
@@ -0,0 +1,36 @@
+# Generated by Django 3.2.25 on 2026-10-17 10:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StreamReference',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_object_id', models.CharField(max_length=255)),
+                ('field_name', models.CharField(max_length=255)),
+                ('block_path', models.CharField(max_length=255)),
+                ('target_object_id', models.CharField(max_length=255)),
+                ('source_content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+                ('target_content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='streamreference',
+            index=models.Index(fields=['target_content_type', 'target_object_id'], name='streamfield_target__d655a4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='streamreference',
+            index=models.Index(fields=['source_content_type', 'source_object_id'], name='streamfield_source__3375ed_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class StreamReferenceQuerySet(models.QuerySet):
+    """
+    Allows filtering on `source` and `target` with a model instance, which
+    generic foreign keys do not support: `filter(target=image)` filters
+    on the target content type and object id instead.
+    """
+
+    def _expand_generic_lookups(self, kwargs):
+        for name in ("source", "target"):
+            if name in kwargs:
+                obj = kwargs.pop(name)
+                kwargs["%s_content_type" % name] = ContentType.objects.get_for_model(
+                    obj
+                )
+                kwargs["%s_object_id" % name] = str(obj.pk)
+        return kwargs
+
+    def filter(self, *args, **kwargs):
+        return super().filter(*args, **self._expand_generic_lookups(kwargs))
+
+    def exclude(self, *args, **kwargs):
+        return super().exclude(*args, **self._expand_generic_lookups(kwargs))
+
+
+class StreamReference(models.Model):
+    """
+    A model instance that a chooser block of a StreamField refers to.
+    `block_path` is the path to the chooser block from the StreamField,
+    as the names of the blocks leading to it joined with dots, like
+    "gallery.item.image"; list items are named "item".
+    """
+
+    source_content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    source_object_id = models.CharField(max_length=255)
+    source = GenericForeignKey("source_content_type", "source_object_id")
+    field_name = models.CharField(max_length=255)
+    block_path = models.CharField(max_length=255)
+    target_content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    target_object_id = models.CharField(max_length=255)
+    target = GenericForeignKey("target_content_type", "target_object_id")
+
+    objects = StreamReferenceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["target_content_type", "target_object_id"]),
+            models.Index(fields=["source_content_type", "source_object_id"]),
+        ]
+
+    def __str__(self):
+        return "%s.%s %s: %s %s" % (
+            self.source_content_type.model,
+            self.field_name,
+            self.block_path,
+            self.target_content_type.model,
+            self.target_object_id,
+        )
@@ -18,3 +18,168 @@ django.jQuery(document).on("formset:added", function(event, $row, formsetName) {
     });
   }
 });
+
+// Merge the errors and HTML of the blocks (see widgets.split_prepared_value)
+// into the value read from a StreamField textarea.
+function mergeStreamFieldValue(value, extras) {
+  if (!extras) {
+    return value;
+  }
+  for (var i = 0; i < value.length; i++) {
+    if (!extras[i]) {
+      continue;
+    }
+    for (var key in extras[i]) {
+      if (key === "children") {
+        mergeStreamFieldValue(value[i].value, extras[i].children);
+      } else {
+        value[i][key] = extras[i][key];
+      }
+    }
+  }
+  return value;
+}
+
+// The initialized StreamFields, by name.
+var streamFields = {};
+
+// Initialize a StreamField with the value of its textarea,
+// so that the value is not included twice in the page.
+window.streamFieldInit = function(name, config, extras, script) {
+  var textarea = document.querySelector('textarea[name="' + name + '"]');
+  var value = JSON.parse(textarea.value);
+  var extrasById = {};
+  for (var i = 0; i < value.length; i++) {
+    extrasById[value[i].id] = extras ? extras[i] : null;
+  }
+  config.value = mergeStreamFieldValue(value, extras);
+  window.streamField.init(name, config, script);
+  // The editor is rendered in a div appended to the parent of the textarea.
+  var wrapper = textarea.parentNode.lastElementChild;
+  var previous = streamFields[name];
+  var field = (streamFields[name] = {
+    config: config,
+    extrasById: extrasById,
+    script: script,
+    textarea: textarea,
+    wrapper: wrapper
+  });
+  if (textarea.hasAttribute("data-delta")) {
+    // The children as the editor first submits them, to find those that changed.
+    // When initialized again, only the children that were loaded are added.
+    field.initial = previous ? previous.initial : {};
+    getStreamFieldValue(field, name).forEach(function(block) {
+      if (!previous || previous.loadedIds.indexOf(block.id) !== -1) {
+        field.initial[block.id] = JSON.stringify(block);
+      }
+    });
+    if (!previous && textarea.form) {
+      textarea.form.addEventListener("submit", function() {
+        submitStreamFieldDelta(name);
+      });
+    }
+  }
+  // Keep the children that are not loaded yet (see BlockWidget.page_size)
+  // after the editor.
+  var stubs = textarea.parentNode.querySelector(
+    'input[name="' + name + '-stubs"]'
+  );
+  if (stubs) {
+    wrapper.parentNode.insertBefore(stubs.parentNode, wrapper.nextSibling);
+  }
+};
+
+// The value of a StreamField editor, with the changes made to it.
+function getStreamFieldValue(field, name) {
+  var input = field.wrapper.querySelector('input[name="' + name + '"]');
+  return JSON.parse((input || field.textarea).value);
+}
+
+// Replace the value submitted by a StreamField editor with a delta:
+// the ids of its children in order, and the children that changed
+// (see BaseStreamBlock.value_from_delta).
+function submitStreamFieldDelta(name) {
+  var field = streamFields[name];
+  if (!field.deltaInput) {
+    // Keep the inputs, in case the form is submitted again.
+    field.input = field.wrapper.querySelector('input[name="' + name + '"]');
+    field.stubsInput = field.textarea.parentNode.querySelector(
+      'input[name="' + name + '-stubs"]'
+    );
+    field.deltaInput = document.createElement("input");
+    field.deltaInput.type = "hidden";
+    field.deltaInput.name = name + "-delta";
+    field.textarea.parentNode.appendChild(field.deltaInput);
+    [field.input, field.stubsInput, field.textarea].forEach(function(input) {
+      if (input) {
+        input.removeAttribute("name");
+      }
+    });
+  }
+  var value = JSON.parse((field.input || field.textarea).value);
+  var delta = {
+    order: value.map(function(block) {
+      return block.id;
+    }),
+    changed: value.filter(function(block) {
+      return field.initial[block.id] !== JSON.stringify(block);
+    })
+  };
+  // The children that were not loaded in the editor did not change.
+  if (field.stubsInput) {
+    delta.order = delta.order.concat(JSON.parse(field.stubsInput.value));
+  }
+  field.deltaInput.value = JSON.stringify(delta);
+}
+
+// Load the next page of the children listed as stubs after a StreamField editor,
+// by id, and initialize the editor again with them appended to its current value.
+window.streamFieldLoadMore = function(button) {
+  var container = button.parentNode;
+  var stubsInput = container.querySelector("input");
+  var name = stubsInput.name.slice(0, -"-stubs".length);
+  var field = streamFields[name];
+  var stubs = JSON.parse(stubsInput.value);
+  var page = stubs.slice(0, parseInt(container.getAttribute("data-page-size"), 10));
+  var csrfToken = button.form.querySelector('input[name="csrfmiddlewaretoken"]');
+  button.disabled = true;
+  django.jQuery
+    .ajax({
+      url: container.getAttribute("data-url"),
+      type: "POST",
+      data: JSON.stringify(page),
+      contentType: "application/json",
+      dataType: "json",
+      headers: { "X-CSRFToken": csrfToken ? csrfToken.value : "" }
+    })
+    .done(function(data) {
+      var value = getStreamFieldValue(field, name);
+      var extras = value.map(function(block) {
+        return field.extrasById[block.id] || null;
+      });
+      extras = extras.concat(data.extras || []);
+      field.loadedIds = data.value.map(function(block) {
+        return block.id;
+      });
+      field.wrapper.parentNode.removeChild(field.wrapper);
+      field.textarea.value = JSON.stringify(value.concat(data.value));
+
+      stubs = stubs.slice(page.length);
+      page.forEach(function(id) {
+        var item = container.querySelector('li[data-id="' + id + '"]');
+        if (item) {
+          item.parentNode.removeChild(item);
+        }
+      });
+      stubsInput.value = JSON.stringify(stubs);
+      if (stubs.length) {
+        button.disabled = false;
+      } else {
+        container.parentNode.removeChild(container);
+      }
+      window.streamFieldInit(name, field.config, extras, field.script);
+    })
+    .fail(function() {
+      button.disabled = false;
+    });
+};
@@ -1,13 +1,19 @@
-import json
+import hashlib
+from contextlib import contextmanager
 
 from django import forms
-from django.core.exceptions import NON_FIELD_ERRORS
+from django.core.exceptions import NON_FIELD_ERRORS, SuspiciousOperation
 from django.core.serializers.json import DjangoJSONEncoder
 from django.forms import Media
 from django.forms.utils import ErrorList
+from django.utils.html import format_html, format_html_join, strip_tags
 from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+from django.utils.translation import get_language
 from django.utils.translation import ugettext_lazy as _
 
+from .codecs import get_codec
+
 
 class ConfigJSONEncoder(DjangoJSONEncoder):
     def default(self, o):
@@ -24,7 +30,92 @@ class InputJSONEncoder(DjangoJSONEncoder):
 
 
 def to_json_script(data, encoder=ConfigJSONEncoder):
-    return json.dumps(data, separators=(",", ":"), cls=encoder).replace("<", "\\u003c")
+    return get_codec().dumps(data, cls=encoder, compact=True).replace("<", "\\u003c")
+
+
+def split_prepared_value(value):
+    """
+    Split a prepared StreamField value into the value as InputJSONEncoder writes it,
+    and a tree of the other keys of its BlockData objects (the errors and HTML used by
+    the editor), with the keys of the nested BlockData objects under "children",
+    or None if there are none.
+
+    window.streamFieldInit merges them back, so that the value is only encoded once.
+    """
+    # Blocks prepare their children as lists of BlockData objects.
+    if not (isinstance(value, list) and value and isinstance(value[0], BlockData)):
+        return value, None
+    input_value = []
+    extras = []
+    for block_data in value:
+        data = block_data.data
+        input_child, children_extras = split_prepared_value(data["value"])
+        input_value.append(
+            {"id": data["id"], "type": data["type"], "value": input_child}
+        )
+        if len(data) == 4 and not data.get("hasError", True):
+            # Only id, type, value and a false hasError, that the editor treats
+            # the same as a missing one.
+            block_extras = {}
+        else:
+            block_extras = {
+                key: item
+                for key, item in data.items()
+                if key not in ("id", "type", "value")
+            }
+        if children_extras is not None:
+            block_extras["children"] = children_extras
+        extras.append(block_extras or None)
+    if not any(extras):
+        return input_value, None
+    return input_value, extras
+
+
+_definitions_json = {}
+
+
+def get_definitions_script(block_def, key):
+    """
+    Return the hash of the child block definitions of a StreamBlock in the active
+    language, and a script adding them to window.streamFieldDefinitions under `key`,
+    the URL of the script.
+
+    The page loading the script does not look the definitions up by their hash,
+    as the process serving the script may have rendered different definitions:
+    they include the objects of chooser blocks, callable choices and random ids.
+    """
+    cache_key = (block_def.definition_prefix, get_language())
+    try:
+        definitions_hash, definitions = _definitions_json[cache_key]
+    except KeyError:
+        from .definitions import get_child_definitions
+
+        definitions = to_json_script(get_child_definitions(block_def))
+        definitions_hash = hashlib.sha1(definitions.encode()).hexdigest()
+        _definitions_json[cache_key] = (definitions_hash, definitions)
+    script = (
+        "window.streamFieldDefinitions = window.streamFieldDefinitions || {};\n"
+        "window.streamFieldDefinitions[%s] = %s;\n" % (to_json_script(key), definitions)
+    )
+    return definitions_hash, script
+
+
+def get_summary(prep_value):
+    """
+    Return a short text summarising the JSONish value of a block:
+    its first non-empty text, without HTML tags.
+    """
+    if isinstance(prep_value, dict):
+        prep_value = list(prep_value.values())
+    if isinstance(prep_value, list):
+        for item in prep_value:
+            summary = get_summary(item)
+            if summary:
+                return summary
+        return ""
+    if prep_value is None or isinstance(prep_value, bool):
+        return ""
+    return Truncator(strip_tags(str(prep_value))).chars(80)
 
 
 class BlockData:
@@ -57,15 +148,136 @@ def get_non_block_errors(errors):
 class BlockWidget(forms.Widget):
     """Wraps a block object as a widget so that it can be incorporated into a Django form"""
 
-    def __init__(self, block_def, attrs=None):
+    def __init__(
+        self,
+        block_def,
+        attrs=None,
+        definitions_url=None,
+        page_size=None,
+        children_url=None,
+        delta=False,
+    ):
         super().__init__(attrs=attrs)
         self.block_def = block_def
+        # The URL of the script defining the child blocks, see StreamFieldAdmin.
+        # If None, the definitions are inlined.
+        self.definitions_url = definitions_url
+        # If set with the URL of the view preparing children on demand
+        # (see StreamFieldAdmin), only the first page_size children of the value
+        # are loaded in the editor, and the others are listed as stubs.
+        self.page_size = page_size
+        self.children_url = children_url
+        # If True, and the value is the StreamValue set as previous_value by
+        # StreamFieldFormMixin, the editor only submits the children that changed.
+        self.delta = delta
+        self.previous_value = None
+        # The objects referred to by the chooser blocks of the submitted value,
+        # see load_choosers.
+        self.chooser_loader = None
+
+    def paginate(self, value):
+        """
+        Split a StreamValue into a StreamValue of its first page_size children,
+        and the id, type and JSONish value of the others. The children are taken
+        as they are, those that were not accessed yet are not converted.
+        """
+        from .blocks import StreamValue
+        from .blocks.stream_block import get_child_data
+
+        children = [value.get_raw_or_child(i) for i in range(len(value))]
+        stubs = []
+        for child in children[self.page_size :]:
+            type_name, prep_value = get_child_data(child)
+            block_id = (
+                child.id if isinstance(child, StreamValue.StreamChild) else child["id"]
+            )
+            stubs.append({"id": block_id, "type": type_name, "value": prep_value})
+        return (
+            StreamValue.from_children(self.block_def, children[: self.page_size]),
+            stubs,
+        )
+
+    def render_stubs(self, name, stubs):
+        """
+        Render the children that are not loaded in the editor as a list,
+        with their ids in a hidden input so that they are taken back from
+        previous_value when the form is submitted.
+        """
+        stub_items = format_html_join(
+            "\n",
+            '<li data-id="{}"><strong>{}</strong> {}</li>',
+            (
+                (
+                    stub["id"],
+                    self.block_def.child_blocks[stub["type"]].label,
+                    get_summary(stub["value"]),
+                )
+                for stub in stubs
+            ),
+        )
+        return format_html(
+            '<div class="c-sf-stubs" data-url="{}" data-page-size="{}">'
+            '<input type="hidden" name="{}-stubs" value="{}">'
+            '<ol class="c-sf-stubs__list">{}</ol>'
+            '<button type="button" class="button" '
+            'onclick="window.streamFieldLoadMore(this)">{}</button>'
+            "</div>",
+            self.children_url,
+            self.page_size,
+            name,
+            to_json_script([stub["id"] for stub in stubs]),
+            stub_items,
+            _("Load more blocks"),
+        )
 
     def render_with_errors(self, name, value, attrs=None, errors=None, renderer=None):
+        from .blocks import StreamValue
+
+        # The changes can be applied to previous_value if the editor is rendered
+        # from it, and each of its children has an id.
+        from_previous_value = (
+            isinstance(value, StreamValue)
+            and value is self.previous_value
+            and len(value.get_children_by_id()) == len(value)
+        )
+        delta = self.delta and from_previous_value
+        stubs_html = ""
+        if (
+            self.page_size
+            and self.children_url
+            and not errors
+            and from_previous_value
+            and len(value) > self.page_size
+        ):
+            value, stubs = self.paginate(value)
+            stubs_html = self.render_stubs(name, stubs)
         streamfield_config = self.get_streamfield_config(value, errors=errors)
-        escaped_value = to_json_script(
-            streamfield_config["value"], encoder=InputJSONEncoder
+        input_value, value_extras = split_prepared_value(
+            streamfield_config.pop("value")
         )
+        # "<" is already escaped by to_json_script.
+        escaped_value = to_json_script(input_value).replace("&", "&amp;")
+        if self.definitions_url is None:
+            definitions_script = ""
+            config_script = to_json_script(streamfield_config)
+        else:
+            # The definitions are loaded from a separate script, that browsers cache.
+            definitions_hash, _script = get_definitions_script(
+                self.block_def, self.definitions_url
+            )
+            definitions_script = format_html(
+                '<script src="{}?v={}"></script>',
+                self.definitions_url,
+                definitions_hash,
+            )
+            del streamfield_config["blockDefinitions"]
+            config_script = (
+                "Object.assign(%s, {blockDefinitions: window.streamFieldDefinitions[%s]})"
+                % (
+                    to_json_script(streamfield_config),
+                    to_json_script(self.definitions_url),
+                )
+            )
         non_block_errors = get_non_block_errors(errors)
         non_block_errors = "".join(
             [
@@ -75,15 +287,19 @@ class BlockWidget(forms.Widget):
         )
         return mark_safe(
             """
-        <textarea style="display: none;" name="%s">%s</textarea>
-        <script>window.streamField.init('%s', %s, document.currentScript)</script>
-        %s
+        <textarea style="display: none;" name="%s"%s>%s</textarea>
+        %s<script>window.streamFieldInit('%s', %s, %s, document.currentScript)</script>
+        %s%s
         """
             % (
                 name,
+                " data-delta" if delta else "",
                 escaped_value,
+                definitions_script,
                 name,
-                to_json_script(streamfield_config),
+                config_script,
+                to_json_script(value_extras),
+                stubs_html,
                 non_block_errors,
             )
         )
@@ -129,21 +345,75 @@ class BlockWidget(forms.Widget):
         }
 
     def get_streamfield_config(self, value, errors=None):
+        from .definitions import get_child_definitions
+
         return {
             "required": self.block_def.required,
             "minNum": self.block_def.meta.min_num,
             "maxNum": self.block_def.meta.max_num,
             "icons": self.get_actions_icons(),
             "labels": self.get_action_labels(),
-            "blockDefinitions": self.block_def.definition["children"],
+            "blockDefinitions": get_child_definitions(self.block_def),
             "value": self.block_def.prepare_value(value, errors=errors),
         }
 
     def value_from_datadict(self, data, files, name):
-        stream_field_data = json.loads(data.get(name))
-        return self.block_def.value_from_datadict(
-            {"value": stream_field_data}, files, name
-        )
+        from .blocks import StreamValue
+
+        codec = get_codec()
+        delta = data.get("%s-delta" % name)
+        if delta is not None and self.previous_value is not None:
+            # The children that were not loaded in the editor are in the delta.
+            try:
+                delta = codec.loads(delta)
+            except ValueError:
+                raise SuspiciousOperation("The StreamField delta is not valid JSON.")
+            self.block_def.validate_delta(delta)
+            with self.load_choosers({"value": delta["changed"]}, files):
+                return self.block_def.value_from_delta(
+                    delta, self.previous_value, files, name
+                )
+        stream_field_data = {"value": codec.loads(data.get(name))}
+        with self.load_choosers(stream_field_data, files):
+            value = self.block_def.value_from_datadict(stream_field_data, files, name)
+        stubs = data.get("%s-stubs" % name)
+        if stubs and self.previous_value is not None:
+            # Append the children that were not loaded in the editor, as they are
+            # in previous_value.
+            stub_ids = codec.loads(stubs)
+            if not isinstance(stub_ids, list) or not all(
+                isinstance(block_id, str) for block_id in stub_ids
+            ):
+                raise SuspiciousOperation(
+                    "The StreamField stubs are not a list of ids."
+                )
+            previous_children = self.previous_value.get_children_by_id()
+            children = list(value)
+            ids = {child.id for child in children}
+            for block_id in stub_ids:
+                if block_id in previous_children and block_id not in ids:
+                    children.append(previous_children[block_id])
+                    ids.add(block_id)
+            value = StreamValue.from_children(self.block_def, children)
+        return value
+
+    @contextmanager
+    def load_choosers(self, data, files):
+        """
+        Fetch the objects referred to by the chooser blocks in the form data of the
+        StreamField with a single query per model, for the chooser blocks to use them
+        while the data is converted, and then validated by BlockField.clean.
+        """
+        from .blocks.base import ChooserLoader, chooser_loader
+
+        self.chooser_loader = ChooserLoader()
+        self.block_def.bulk_collect_datadict(data, files, self.chooser_loader)
+        self.chooser_loader.load()
+        token = chooser_loader.set(self.chooser_loader)
+        try:
+            yield
+        finally:
+            chooser_loader.reset(token)
 
     def value_omitted_from_data(self, data, files, name):
         return self.block_def.value_omitted_from_data(data, files, name)
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+
+# The lookups are also tested on PostgreSQL when the name of a database is set,
+# the connection parameters being read from the PG* environment variables.
+if os.environ.get("STREAMFIELD_TEST_POSTGRESQL_NAME"):
+    DATABASES["postgresql"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ["STREAMFIELD_TEST_POSTGRESQL_NAME"],
+    }
+
+
+def pytest_configure():
+    settings.configure(
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "django_react_streamfield",
+            "testapp",
+        ],
+        DATABASES=DATABASES,
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+        USE_TZ=True,
+    )
+    django.setup()
+
+    from django.core.management import call_command
+
+    for alias in DATABASES:
+        call_command("migrate", database=alias, run_syncdb=True, verbosity=0)
@@ -0,0 +1,39 @@
+from django import forms
+
+from django_react_streamfield import blocks
+from django_react_streamfield.checks import check_block_tree
+from django_react_streamfield.fields import StreamField
+
+from testapp.models import Image, ImageChooserBlock
+
+
+class WidgetlessChooserBlock(blocks.ChooserBlock):
+    target_model = Image
+
+
+class SlicedChooserBlock(ImageChooserBlock):
+    @property
+    def field(self):
+        return forms.ModelChoiceField(queryset=Image.objects.all()[:10])
+
+
+class BrokenChooserBlock(ImageChooserBlock):
+    @property
+    def field(self):
+        raise ValueError
+
+
+def get_warning_ids(block_types):
+    field = StreamField(block_types)
+    field.set_attributes_from_name("body")
+    return [warning.id for warning in check_block_tree(field.stream_block, field)]
+
+
+def test_select_chooser():
+    assert get_warning_ids([("image", ImageChooserBlock())]) == ["streamfield.W002"]
+    assert get_warning_ids([("image", SlicedChooserBlock())]) == []
+
+
+def test_chooser_without_form_field():
+    assert get_warning_ids([("image", WidgetlessChooserBlock())]) == []
+    assert get_warning_ids([("image", BrokenChooserBlock())]) == []
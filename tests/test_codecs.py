@@ -0,0 +1,156 @@
+import dataclasses
+import datetime
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+from django_react_streamfield.codecs import JSONCodec, OrjsonCodec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+requires_orjson = pytest.mark.skipif(orjson is None, reason="orjson is not installed.")
+
+STREAM_DATA = [
+    {
+        "type": "heading",
+        "value": 'Zürich – 東京 ✓ "quoted" </script>',
+        "id": "0c2e9b36-3d2b-4f43-9a4e-3b8f3a3f6c11",
+    },
+    {
+        "type": "product",
+        "value": {
+            "price": Decimal("1234.50"),
+            "ratio": 0.25,
+            "count": 3,
+            "available": True,
+            "discount": None,
+            "label": gettext_lazy("Price"),
+            "reference": uuid.UUID("6f1c2b4e-8f0a-4d7e-9c3b-2a1d5e6f7a8b"),
+        },
+        "id": "9d9e1a52-7c61-4f0b-b1d4-55c0e2a6f0a3",
+    },
+    {
+        "type": "event",
+        "value": {
+            "date": datetime.date(2020, 2, 29),
+            "start": datetime.time(9, 30, 15, 123456),
+            "created": datetime.datetime(
+                2020, 2, 29, 9, 30, 15, 123456, tzinfo=timezone.utc
+            ),
+            "duration": datetime.timedelta(hours=1, minutes=30),
+        },
+        "id": "2a7f3c1d-0b5e-4c8a-a6d9-8e1f4b7c3d20",
+    },
+    {
+        "type": "gallery",
+        "value": [1, 2, 3],
+        "id": "5b8e0d4f-1a2c-4e6b-9f7a-0c3d2e1b4a56",
+    },
+    {"type": "counts", "value": {1: "one", 2: "two"}, "id": ""},
+]
+
+DECODED_DATA = [
+    {
+        "type": "heading",
+        "value": 'Zürich – 東京 ✓ "quoted" </script>',
+        "id": "0c2e9b36-3d2b-4f43-9a4e-3b8f3a3f6c11",
+    },
+    {
+        "type": "product",
+        "value": {
+            "price": "1234.50",
+            "ratio": 0.25,
+            "count": 3,
+            "available": True,
+            "discount": None,
+            "label": "Price",
+            "reference": "6f1c2b4e-8f0a-4d7e-9c3b-2a1d5e6f7a8b",
+        },
+        "id": "9d9e1a52-7c61-4f0b-b1d4-55c0e2a6f0a3",
+    },
+    {
+        "type": "event",
+        "value": {
+            "date": "2020-02-29",
+            "start": "09:30:15.123",
+            "created": "2020-02-29T09:30:15.123Z",
+            "duration": "P0DT01H30M00S",
+        },
+        "id": "2a7f3c1d-0b5e-4c8a-a6d9-8e1f4b7c3d20",
+    },
+    {
+        "type": "gallery",
+        "value": [1, 2, 3],
+        "id": "5b8e0d4f-1a2c-4e6b-9f7a-0c3d2e1b4a56",
+    },
+    {"type": "counts", "value": {"1": "one", "2": "two"}, "id": ""},
+]
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+class PointEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, Point):
+            return [o.x, o.y]
+        return super().default(o)
+
+
+CODECS = [JSONCodec, pytest.param(OrjsonCodec, marks=requires_orjson)]
+
+
+@pytest.fixture(params=CODECS)
+def codec(request):
+    return request.param()
+
+
+@pytest.fixture(params=CODECS)
+def other_codec(request):
+    return request.param()
+
+
+@requires_orjson
+def test_compact_output_is_identical():
+    assert JSONCodec().dumps(STREAM_DATA, compact=True) == OrjsonCodec().dumps(
+        STREAM_DATA
+    )
+
+
+def test_round_trip(codec):
+    assert codec.loads(codec.dumps(STREAM_DATA)) == DECODED_DATA
+    assert codec.loads(codec.dumps(STREAM_DATA, compact=True)) == DECODED_DATA
+
+
+def test_loads_output_of_other_codec(codec, other_codec):
+    assert codec.loads(other_codec.dumps(STREAM_DATA)) == DECODED_DATA
+
+
+def test_encoder_class_passthrough(codec):
+    data = {"point": Point(1, 2), "date": datetime.date(2020, 1, 1)}
+    output = codec.dumps(data, cls=PointEncoder, compact=True)
+    assert output == '{"point":[1,2],"date":"2020-01-01"}'
+
+
+def test_unsupported_type(codec):
+    with pytest.raises(TypeError):
+        codec.dumps({"point": Point(1, 2)})
+
+
+def test_raw_decode(codec):
+    raw = codec.dumps(STREAM_DATA[0]) + codec.dumps(STREAM_DATA[3])
+    value, end = codec.raw_decode(raw, 0)
+    assert value == DECODED_DATA[0]
+    value, end = codec.raw_decode(raw, end)
+    assert value == DECODED_DATA[3]
+    assert end == len(raw)
@@ -0,0 +1,33 @@
+import pytest
+from django.test import override_settings
+
+from testapp.models import TextPage
+
+MALFORMED_JSON = [
+    "not JSON",
+    "[1, 2",
+    '[{"type": "heading", "value": "Heading"}',
+    '[{"type": "heading", "value": "Heading"} {"type": "heading"}]',
+]
+
+
+@pytest.mark.parametrize("deferred_decoding", [False, True])
+@pytest.mark.parametrize("raw_json", MALFORMED_JSON)
+def test_malformed_json(raw_json, deferred_decoding):
+    field = TextPage._meta.get_field("body")
+    with override_settings(STREAMFIELD_DEFERRED_DECODING=deferred_decoding):
+        value = field.to_python(raw_json)
+    assert list(value) == []
+    assert str(value) == ""
+    assert value.raw_text == raw_json
+    assert field.get_prep_value(value) == raw_json
+
+
+def test_deferred_decoding():
+    field = TextPage._meta.get_field("body")
+    raw_json = '[{"type": "heading", "value": "Heading", "id": "1"}, {]'
+    with override_settings(STREAMFIELD_DEFERRED_DECODING=True):
+        value = field.to_python(raw_json)
+    assert value.raw_text is None
+    assert len(value) == 0
+    assert value.raw_text == raw_json
@@ -0,0 +1,45 @@
+from decimal import Decimal
+
+import pytest
+
+from django_react_streamfield import blocks
+from django_react_streamfield.generators import StreamGenerator
+
+NUMBER_BLOCKS = [
+    (blocks.IntegerBlock, {}),
+    (blocks.IntegerBlock, {"min_value": 5}),
+    (blocks.IntegerBlock, {"max_value": -5}),
+    (blocks.IntegerBlock, {"min_value": -10, "max_value": -5}),
+    (blocks.FloatBlock, {"max_value": -1}),
+    (blocks.FloatBlock, {"min_value": Decimal("0.5"), "max_value": Decimal("2")}),
+    (blocks.DecimalBlock, {"max_digits": 4, "decimal_places": 2}),
+    (blocks.DecimalBlock, {"max_digits": 3, "decimal_places": 3}),
+    (blocks.DecimalBlock, {"max_value": Decimal("-1.5"), "decimal_places": 1}),
+    (
+        blocks.DecimalBlock,
+        {
+            "min_value": Decimal("1.555"),
+            "max_value": Decimal("9.25"),
+            "decimal_places": 2,
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "block_class, kwargs",
+    NUMBER_BLOCKS,
+    ids=[
+        "%s(%s)"
+        % (
+            block_class.__name__,
+            ", ".join("%s=%s" % (name, value) for name, value in kwargs.items()),
+        )
+        for block_class, kwargs in NUMBER_BLOCKS
+    ],
+)
+def test_generated_numbers_are_valid(block_class, kwargs):
+    block = block_class(**kwargs)
+    for seed in range(50):
+        value = StreamGenerator(seed=seed).generate(block)
+        block.clean(block.to_python(value))
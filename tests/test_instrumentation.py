@@ -0,0 +1,32 @@
+import pytest
+from django.db import transaction
+
+from django_react_streamfield.instrumentation import instrumented
+
+from testapp.models import Image, TextPage
+
+
+@pytest.fixture
+def page():
+    with transaction.atomic():
+        images = [Image.objects.create(title="Image %d" % i) for i in range(3)]
+        page = TextPage.objects.create(
+            body=[
+                ("image", images[0]),
+                ("card", {"title": "Card", "image": images[1]}),
+                ("gallery", [images[2], images[0]]),
+            ]
+        )
+        yield TextPage.objects.get(pk=page.pk)
+        transaction.set_rollback(True)
+
+
+def test_prefetch_queries_are_charged_to_chooser_blocks(page):
+    with instrumented() as stats:
+        str(page.body)
+    rows = [
+        (row["block_name"], row["method"], row["own_queries"])
+        for row in stats.report()
+        if row["own_queries"]
+    ]
+    assert rows == [("image", "bulk_fetch", 1)]
@@ -0,0 +1,110 @@
+from unittest import mock
+
+import pytest
+from django.db import connections, transaction
+
+from testapp.models import Image, JSONPage, TextPage
+
+DATABASES = [
+    "default",
+    pytest.param(
+        "postgresql",
+        marks=pytest.mark.skipif(
+            "postgresql" not in connections.databases,
+            reason="STREAMFIELD_TEST_POSTGRESQL_NAME is not set.",
+        ),
+    ),
+]
+
+
+@pytest.fixture(params=DATABASES)
+def using(request):
+    with transaction.atomic(using=request.param):
+        yield request.param
+        transaction.set_rollback(True, using=request.param)
+
+
+@pytest.fixture(params=[TextPage, JSONPage], ids=["text", "json"])
+def model(request):
+    return request.param
+
+
+@pytest.fixture
+def pages(model, using):
+    images = [Image.objects.using(using).create(title="Image %d" % i) for i in range(4)]
+    bodies = {
+        "empty": [],
+        "heading": [("heading", "Heading")],
+        "image": [("heading", "Heading"), ("image", images[0])],
+        "card": [
+            ("card", {"title": "Card", "image": images[1]}),
+            ("card", {"title": "Card", "image": None}),
+            ("heading", "Heading"),
+        ],
+        "gallery": [("gallery", [images[2], images[0]])],
+    }
+    pks = {
+        name: model.objects.using(using).create(body=body).pk
+        for name, body in bodies.items()
+    }
+    return pks, images
+
+
+def matches(model, using, **lookups):
+    return set(
+        model.objects.using(using).filter(**lookups).values_list("pk", flat=True)
+    )
+
+
+def test_has_block(model, using, pages):
+    pks, images = pages
+    assert matches(model, using, body__has_block="heading") == {
+        pks["heading"],
+        pks["image"],
+        pks["card"],
+    }
+    assert matches(model, using, body__has_block="card") == {pks["card"]}
+    assert matches(model, using, body__has_block="gallery") == {pks["gallery"]}
+    assert matches(model, using, body__has_block="unknown") == set()
+
+
+def test_block_count(model, using, pages):
+    pks, images = pages
+    assert matches(model, using, body__block_count__gt=1) == {pks["image"], pks["card"]}
+    assert matches(model, using, body__block_count__lte=1) == {
+        pks["empty"],
+        pks["heading"],
+        pks["gallery"],
+    }
+    assert matches(model, using, body__block_count=0) == {pks["empty"]}
+
+
+def test_references(model, using, pages):
+    pks, images = pages
+    # At the top level and in a ListBlock.
+    assert matches(model, using, body__references=images[0]) == {
+        pks["image"],
+        pks["gallery"],
+    }
+    # In a StructBlock.
+    assert matches(model, using, body__references=images[1]) == {pks["card"]}
+    assert matches(model, using, body__references=images[2]) == {pks["gallery"]}
+    assert matches(model, using, body__references=images[3]) == set()
+
+
+def test_references_of_another_model(model, using, pages):
+    assert matches(model, using, body__references=model(pk=1)) == set()
+
+
+def get_errors(field):
+    return [
+        error.id for error in field.check(databases=["default"]) if error.is_serious()
+    ]
+
+
+def test_json_field_check():
+    assert get_errors(JSONPage._meta.get_field("body")) == []
+    features = connections["default"].features
+    with mock.patch.object(features, "supports_json_field", False):
+        assert get_errors(JSONPage._meta.get_field("body")) == ["streamfield.E001"]
+        assert get_errors(TextPage._meta.get_field("body")) == []
@@ -0,0 +1,48 @@
+import pytest
+from django.core.exceptions import SuspiciousOperation
+
+from testapp.models import TextPage
+
+VALUE = [
+    {"type": "heading", "value": "First", "id": "1"},
+    {"type": "heading", "value": "Second", "id": "2"},
+]
+
+
+@pytest.fixture
+def stream_block():
+    return TextPage._meta.get_field("body").stream_block
+
+
+def test_value_from_delta(stream_block):
+    value = stream_block.to_python(VALUE)
+    delta = {
+        "order": ["2", "3", "1"],
+        "changed": [{"type": "heading", "value": "Third", "id": "3"}],
+    }
+    new_value = stream_block.value_from_delta(delta, value, {}, "body")
+    assert [(child.id, child.value) for child in new_value] == [
+        ("2", "Second"),
+        ("3", "Third"),
+        ("1", "First"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "delta",
+    [
+        [],
+        {"changed": []},
+        {"order": ["1", "2"]},
+        {"order": "12", "changed": []},
+        {"order": [["1"]], "changed": []},
+        {"order": ["1", "1"], "changed": []},
+        {"order": ["1", "2"], "changed": [{"value": "First", "id": "1"}]},
+        {"order": ["1", "2"], "changed": [{"type": "heading", "value": "First"}]},
+        {"order": ["1", "2"], "changed": ["1"]},
+    ],
+)
+def test_malformed_delta(stream_block, delta):
+    value = stream_block.to_python(VALUE)
+    with pytest.raises(SuspiciousOperation):
+        stream_block.value_from_delta(delta, value, {}, "body")
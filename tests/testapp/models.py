@@ -0,0 +1,38 @@
+from django import forms
+from django.db import models
+
+from django_react_streamfield import blocks
+from django_react_streamfield.fields import StreamField
+
+
+class Image(models.Model):
+    title = models.CharField(max_length=255)
+
+    def __str__(self):
+        return self.title
+
+
+class ImageChooserBlock(blocks.ChooserBlock):
+    target_model = Image
+    widget = forms.Select
+
+
+class CardBlock(blocks.StructBlock):
+    title = blocks.CharBlock()
+    image = ImageChooserBlock(required=False)
+
+
+BODY_BLOCKS = [
+    ("heading", blocks.CharBlock()),
+    ("image", ImageChooserBlock()),
+    ("card", CardBlock()),
+    ("gallery", blocks.ListBlock(ImageChooserBlock())),
+]
+
+
+class TextPage(models.Model):
+    body = StreamField(BODY_BLOCKS, blank=True)
+
+
+class JSONPage(models.Model):
+    body = StreamField(BODY_BLOCKS, blank=True, use_json_field=True)